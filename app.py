@@ -1,23 +1,229 @@
-from flask import Flask, request, jsonify
 import os
-from dotenv import load_dotenv
-from osconstruction import create_client
-from werkzeug.exceptions import BadRequest, NotFound
+import re
+import hmac
+import threading
+from functools import wraps
+from flask import Flask, Response, request, jsonify
+from flask_caching import Cache
+from flask_compress import Compress
+from cachetools import TTLCache
+from werkzeug.exceptions import BadRequest, HTTPException, NotFound
+from postgrest.exceptions import APIError
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, generate_latest, multiprocess
+from pydantic import ValidationError as PydanticValidationError
 
-# Load environment variables
-load_dotenv()
+# Shared, memoized Supabase client - every request reuses the same PostgREST session
+from supabase_client import get_supabase_client
+from retry import retry_db
+from json_provider import ORJSONProvider
+from models import (
+    CompanyCreate, CompanyUpdate, ServiceCreate, ProjectCreate, EmployeeCreate,
+    CompanyResponse, ServiceResponse, ProjectResponse, EmployeeResponse, list_adapter
+)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
-# Initialize Supabase client
-def get_supabase_client():
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
+# Brotli/gzip for JSON bodies worth compressing; row arrays shrink several-fold
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 500
+Compress(app)
+
+# Read-through cache for the company endpoints - shared Redis when configured,
+# otherwise nothing is cached: a per-process cache would only be invalidated in
+# the worker that handled a write
+cache = Cache(app, config={
+    "CACHE_TYPE": "RedisCache" if os.environ.get("REDIS_URL") else "NullCache",
+    "CACHE_REDIS_URL": os.environ.get("REDIS_URL"),
+    "CACHE_DEFAULT_TIMEOUT": 60
+})
+
+COMPANIES_CACHE_KEY = "companies"
+
+def company_cache_key(company_id):
+    """Cache key for a single company response."""
+    return f"company:{company_id}"
+
+def validate_body(model):
+    """Validate the request body with a Pydantic model and return the row(s) to insert.
+
+    pydantic-core compiles each model's validator once, so required fields,
+    types and formats are checked in a single pass instead of Python loops.
+    It also parses the raw body itself, so no intermediate dict is built.
+    A JSON array is validated as a whole and returned as a list of rows.
+    """
+    if not request.is_json:
+        raise BadRequest("Request body must be JSON")
+    body = request.get_data(cache=False).strip()
+    if not body:
+        raise BadRequest("No data provided")
+    
+    try:
+        if body.startswith(b"["):
+            # PostgREST rejects bulk inserts whose objects have different keys,
+            # so every row carries the full column set, defaults included
+            adapter = list_adapter(model)
+            rows = adapter.dump_python(adapter.validate_json(body), mode="json")
+            if not rows:
+                raise BadRequest("No data provided")
+            return rows
+        return model.model_validate_json(body).model_dump(mode="json", exclude_unset=True)
+    except PydanticValidationError as e:
+        # Errors without a location (malformed JSON) apply to the whole body
+        error_messages = [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err['loc'] else err['msg']
+                          for err in e.errors()]
+        raise BadRequest(f"Invalid data: {'; '.join(error_messages)}")
+
+def selected_fields(model):
+    """Return the columns requested via ?fields=, checked against a response model.
+
+    Clients that only need a few columns skip marshalling the rest (large
+    description/text fields in particular). Without ?fields= every column
+    is returned, as before.
+    """
+    fields = request.args.get("fields")
+    if not fields:
+        return ("*",)
+    
+    columns = tuple(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    unknown = [column for column in columns if column not in model.model_fields]
+    if not columns or unknown:
+        raise BadRequest(f"Invalid fields: {', '.join(unknown) or fields}")
+    
+    return columns
+
+def partial_response():
+    """Only full-row responses are cached, so writes can invalidate them by key."""
+    return "fields" in request.args
+
+def created_response(data, response):
+    """201 response echoing the inserted row, or all rows for a bulk insert."""
+    if isinstance(data, list):
+        return jsonify(response.data), 201
+    return jsonify(response.data[0]), 201
+
+# Company IDs recently confirmed missing. A deleted ID can be written again
+# (bulk_upsert in os_construction.py keeps the IDs it is given), so company
+# writes made here drop the ID straight away; the TTL bounds how long a row
+# recreated by another process (a seed or import) keeps answering 404.
+# TTLCache isn't thread-safe, hence the lock.
+missing_companies = TTLCache(maxsize=10_000, ttl=30)
+missing_companies_lock = threading.Lock()
+
+def remember_missing_company(company_id):
+    """Record that a company doesn't exist."""
+    with missing_companies_lock:
+        missing_companies[company_id] = True
+
+def forget_missing_company(company_id):
+    """Drop a company from the missing set after its row was written."""
+    with missing_companies_lock:
+        missing_companies.pop(company_id, None)
+
+def company_not_found(company_id):
+    """Remember that a company doesn't exist and return the 404 to raise."""
+    remember_missing_company(company_id)
+    return NotFound(f"Company with ID {company_id} not found")
+
+def reject_missing_company(company_id):
+    """Raise a 404 without a round-trip for a company recently found missing."""
+    with missing_companies_lock:
+        missing = company_id in missing_companies
+    if missing:
+        raise NotFound(f"Company with ID {company_id} not found")
+
+# Postgres SQLSTATE raised when company_id does not reference an existing company
+FOREIGN_KEY_VIOLATION = "23503"
+
+# PostgREST error code returned by .single() when no row matches
+NO_ROWS_FOUND = "PGRST116"
+
+def fetch_company_children(table, company_id, columns=("*",), **filters):
+    """Fetch the rows of a child table for one company.
+
+    The children are embedded in a select on the company itself, so PostgREST
+    resolves both in a single query and a missing company surfaces as a 404.
+    """
+    reject_missing_company(company_id)
+    embed = f"{table}({','.join(columns)})"
+    
+    def execute():
+        query = get_supabase_client().table("os_construction").select("id", embed).eq("id", company_id)
+        
+        # Filters on the embedded resource narrow the children, not the company
+        for column, value in filters.items():
+            query = query.eq(f"{table}.{column}", value)
+        
+        return query.single().execute()
     
-    if not supabase_url or not supabase_key:
-        raise ValueError("Missing Supabase credentials. Set SUPABASE_URL and SUPABASE_KEY environment variables.")
+    try:
+        response = retry_db(execute)
+    except APIError as e:
+        if e.code == NO_ROWS_FOUND:
+            raise company_not_found(company_id)
+        raise
     
-    return create_client(supabase_url, supabase_key)
+    return response.data[table]
+
+def insert_company_child(table, company_id, data):
+    """Insert one row, or a list of rows, that belong to a company.
+
+    The company_id foreign key does the existence check, so a missing company
+    costs no extra round-trip and surfaces as a 404.
+    """
+    reject_missing_company(company_id)
+    
+    for row in data if isinstance(data, list) else [data]:
+        row["company_id"] = company_id
+    
+    try:
+        return retry_db(lambda: get_supabase_client().table(table).insert(data).execute(), idempotent=False)
+    except APIError as e:
+        if e.code == FOREIGN_KEY_VIOLATION:
+            raise company_not_found(company_id)
+        raise
+
+# Flask-Compress appends the encoding to the ETag it sends ("<hash>:br")
+COMPRESSED_ETAG_SUFFIX = re.compile(r':(?:br|gzip|deflate)"')
+
+@app.after_request
+def add_conditional_headers(response):
+    """Tag successful reads with an ETag and answer matching If-None-Match with 304.
+
+    Runs after the cache lookup, so a polling client with an unchanged
+    resource gets an empty 304 instead of the full body. Clients must still
+    revalidate every time, so writes are never hidden behind a max-age.
+    """
+    if request.method == "GET" and response.status_code == 200:
+        response.add_etag()
+        response.headers["Cache-Control"] = "private, no-cache"
+        
+        # Compare against the uncompressed body's tag, whatever encoding the client got
+        if_none_match = request.environ.get("HTTP_IF_NONE_MATCH")
+        if if_none_match:
+            request.environ["HTTP_IF_NONE_MATCH"] = COMPRESSED_ETAG_SUFFIX.sub('"', if_none_match)
+        
+        response.make_conditional(request)
+    return response
+
+def log_errors(action):
+    """Log unexpected errors raised by a view before they reach the error handlers.
+
+    action is formatted with the view's URL arguments, e.g.
+    "fetching company {company_id}". Client errors (4xx) are re-raised as-is.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                return view(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                app.logger.error(f"Error {action.format(**kwargs)}: {e}")
+                raise
+        return wrapper
+    return decorator
 
 # Error handling
 @app.errorhandler(BadRequest)
@@ -32,253 +238,175 @@ def handle_not_found(e):
 def handle_generic_exception(e):
     return jsonify({"error": "Internal Server Error", "message": str(e)}), 500
 
+# Bearer token a Prometheus scraper must send to read /metrics. Without one
+# /metrics is off: behind a reverse proxy every request comes from localhost,
+# so the client address can't tell a local scraper from the public.
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN")
+
+def metrics_allowed():
+    """Whether the current request may read /metrics."""
+    if not METRICS_TOKEN:
+        return False
+    expected = f"Bearer {METRICS_TOKEN}".encode()
+    return hmac.compare_digest(request.headers.get("Authorization", "").encode(), expected)
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus metrics, including per-route PostgREST call counts and latency"""
+    # Routes and call volumes are not for clients, so hide the endpoint from them
+    if not metrics_allowed():
+        raise NotFound()
+    
+    registry = REGISTRY
+    
+    # Under several gunicorn workers, aggregate every process's samples
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    
+    return Response(generate_latest(registry), mimetype=CONTENT_TYPE_LATEST)
+
 # Company endpoints
 @app.route("/api/companies", methods=["GET"])
+@cache.cached(timeout=60, key_prefix=COMPANIES_CACHE_KEY, unless=partial_response)
+@log_errors("fetching companies")
 def get_companies():
     """Get all construction companies"""
-    try:
-        supabase = get_supabase_client()
-        response = supabase.table("os_construction").select("*").execute()
-        return jsonify(response.data)
-    except Exception as e:
-        app.logger.error(f"Error fetching companies: {e}")
-        raise
+    columns = selected_fields(CompanyResponse)
+    response = retry_db(lambda: get_supabase_client().table("os_construction").select(*columns).execute())
+    return jsonify(response.data)
 
 @app.route("/api/companies/<company_id>", methods=["GET"])
+@cache.cached(timeout=60, make_cache_key=company_cache_key, unless=partial_response)
+@log_errors("fetching company {company_id}")
 def get_company(company_id):
     """Get a specific company by ID"""
-    try:
-        supabase = get_supabase_client()
-        response = supabase.table("os_construction").select("*").eq("id", company_id).execute()
+    columns = selected_fields(CompanyResponse)
+    response = retry_db(lambda: get_supabase_client().table("os_construction").select(*columns).eq("id", company_id).execute())
+    
+    if not response.data:
+        raise NotFound(f"Company with ID {company_id} not found")
         
-        if not response.data:
-            raise NotFound(f"Company with ID {company_id} not found")
-            
-        return jsonify(response.data[0])
-    except Exception as e:
-        app.logger.error(f"Error fetching company {company_id}: {e}")
-        raise
+    return jsonify(response.data[0])
 
 @app.route("/api/companies", methods=["POST"])
+@log_errors("creating company")
 def create_company():
     """Create a new company"""
-    try:
-        data = request.json
-        
-        if not data:
-            raise BadRequest("No data provided")
-            
-        required_fields = ["company_name", "company_address", "company_email", "company_phone"]
-        for field in required_fields:
-            if field not in data:
-                raise BadRequest(f"Missing required field: {field}")
-        
-        supabase = get_supabase_client()
-        response = supabase.table("os_construction").insert(data).execute()
-        
-        return jsonify(response.data[0]), 201
-    except Exception as e:
-        app.logger.error(f"Error creating company: {e}")
-        raise
+    data = validate_body(CompanyCreate)
+    
+    response = retry_db(lambda: get_supabase_client().table("os_construction").insert(data).execute(), idempotent=False)
+    for row in response.data:
+        forget_missing_company(row["id"])
+    cache.delete(COMPANIES_CACHE_KEY)
+    
+    return created_response(data, response)
 
 @app.route("/api/companies/<company_id>", methods=["PUT"])
+@log_errors("updating company {company_id}")
 def update_company(company_id):
     """Update an existing company"""
-    try:
-        data = request.json
-        
-        if not data:
-            raise BadRequest("No data provided")
-            
-        supabase = get_supabase_client()
-        
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise NotFound(f"Company with ID {company_id} not found")
-        
-        response = supabase.table("os_construction").update(data).eq("id", company_id).execute()
-        
-        return jsonify(response.data[0])
-    except Exception as e:
-        app.logger.error(f"Error updating company {company_id}: {e}")
-        raise
+    # Only the fields sent are updated; the raw body is validated in one pass
+    data = validate_body(CompanyUpdate)
+    
+    if isinstance(data, list):
+        raise BadRequest("Request body must be a JSON object")
+    if not data:
+        raise BadRequest("No data provided")
+    
+    # An update that matches no rows means the company doesn't exist
+    response = retry_db(lambda: get_supabase_client().table("os_construction").update(data).eq("id", company_id).execute())
+    if not response.data:
+        raise NotFound(f"Company with ID {company_id} not found")
+    
+    forget_missing_company(company_id)
+    cache.delete_many(COMPANIES_CACHE_KEY, company_cache_key(company_id))
+    
+    return jsonify(response.data[0])
 
 @app.route("/api/companies/<company_id>", methods=["DELETE"])
+@log_errors("deleting company {company_id}")
 def delete_company(company_id):
     """Delete a company"""
-    try:
-        supabase = get_supabase_client()
-        
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise NotFound(f"Company with ID {company_id} not found")
-        
-        supabase.table("os_construction").delete().eq("id", company_id).execute()
-        
-        return jsonify({"message": f"Company with ID {company_id} deleted successfully"}), 200
-    except Exception as e:
-        app.logger.error(f"Error deleting company {company_id}: {e}")
-        raise
+    # The delete returns the removed rows, so an empty result means the company doesn't exist.
+    # It isn't resent after a read failure: the first attempt may already have removed the
+    # row, and the empty retry would report a false 404.
+    response = retry_db(lambda: get_supabase_client().table("os_construction").delete().eq("id", company_id).execute(),
+                        idempotent=False)
+    if not response.data:
+        raise company_not_found(company_id)
+    
+    # Nested endpoints for the deleted company can 404 straight away
+    remember_missing_company(company_id)
+    
+    cache.delete_many(COMPANIES_CACHE_KEY, company_cache_key(company_id))
+    
+    return jsonify({"message": f"Company with ID {company_id} deleted successfully"}), 200
 
 # Service endpoints
 @app.route("/api/companies/<company_id>/services", methods=["GET"])
+@log_errors("fetching services for company {company_id}")
 def get_company_services(company_id):
     """Get all services for a company"""
-    try:
-        supabase = get_supabase_client()
-        
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise NotFound(f"Company with ID {company_id} not found")
-        
-        response = supabase.table("os_construction_services").select("*").eq("company_id", company_id).execute()
-        
-        return jsonify(response.data)
-    except Exception as e:
-        app.logger.error(f"Error fetching services for company {company_id}: {e}")
-        raise
+    columns = selected_fields(ServiceResponse)
+    services = fetch_company_children("os_construction_services", company_id, columns)
+    
+    return jsonify(services)
 
 @app.route("/api/companies/<company_id>/services", methods=["POST"])
+@log_errors("adding service for company {company_id}")
 def add_company_service(company_id):
     """Add a new service for a company"""
-    try:
-        data = request.json
-        
-        if not data:
-            raise BadRequest("No data provided")
-            
-        required_fields = ["service_name"]
-        for field in required_fields:
-            if field not in data:
-                raise BadRequest(f"Missing required field: {field}")
-        
-        supabase = get_supabase_client()
-        
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise NotFound(f"Company with ID {company_id} not found")
-        
-        # Add company_id to data
-        data["company_id"] = company_id
-        
-        response = supabase.table("os_construction_services").insert(data).execute()
-        
-        return jsonify(response.data[0]), 201
-    except Exception as e:
-        app.logger.error(f"Error adding service for company {company_id}: {e}")
-        raise
+    data = validate_body(ServiceCreate)
+    
+    response = insert_company_child("os_construction_services", company_id, data)
+    
+    return created_response(data, response)
 
 # Project endpoints
 @app.route("/api/companies/<company_id>/projects", methods=["GET"])
+@log_errors("fetching projects for company {company_id}")
 def get_company_projects(company_id):
     """Get all projects for a company"""
-    try:
-        supabase = get_supabase_client()
-        
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise NotFound(f"Company with ID {company_id} not found")
-        
-        # Get optional status filter
-        status = request.args.get("status")
-        
-        query = supabase.table("os_construction_projects").select("*").eq("company_id", company_id)
-        
-        if status:
-            query = query.eq("status", status)
-            
-        response = query.execute()
-        
-        return jsonify(response.data)
-    except Exception as e:
-        app.logger.error(f"Error fetching projects for company {company_id}: {e}")
-        raise
+    # Get optional status filter
+    status = request.args.get("status")
+    
+    filters = {"status": status} if status else {}
+    columns = selected_fields(ProjectResponse)
+    projects = fetch_company_children("os_construction_projects", company_id, columns, **filters)
+    
+    return jsonify(projects)
 
 @app.route("/api/companies/<company_id>/projects", methods=["POST"])
+@log_errors("adding project for company {company_id}")
 def add_company_project(company_id):
     """Add a new project for a company"""
-    try:
-        data = request.json
-        
-        if not data:
-            raise BadRequest("No data provided")
-            
-        required_fields = ["project_name", "location"]
-        for field in required_fields:
-            if field not in data:
-                raise BadRequest(f"Missing required field: {field}")
-        
-        supabase = get_supabase_client()
-        
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise NotFound(f"Company with ID {company_id} not found")
-        
-        # Add company_id to data
-        data["company_id"] = company_id
-        
-        response = supabase.table("os_construction_projects").insert(data).execute()
-        
-        return jsonify(response.data[0]), 201
-    except Exception as e:
-        app.logger.error(f"Error adding project for company {company_id}: {e}")
-        raise
+    data = validate_body(ProjectCreate)
+    
+    response = insert_company_child("os_construction_projects", company_id, data)
+    
+    return created_response(data, response)
 
 # Employee endpoints
 @app.route("/api/companies/<company_id>/employees", methods=["GET"])
+@log_errors("fetching employees for company {company_id}")
 def get_company_employees(company_id):
     """Get all employees for a company"""
-    try:
-        supabase = get_supabase_client()
-        
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise NotFound(f"Company with ID {company_id} not found")
-        
-        response = supabase.table("os_construction_employees").select("*").eq("company_id", company_id).execute()
-        
-        return jsonify(response.data)
-    except Exception as e:
-        app.logger.error(f"Error fetching employees for company {company_id}: {e}")
-        raise
+    columns = selected_fields(EmployeeResponse)
+    employees = fetch_company_children("os_construction_employees", company_id, columns)
+    
+    return jsonify(employees)
 
 @app.route("/api/companies/<company_id>/employees", methods=["POST"])
+@log_errors("adding employee for company {company_id}")
 def add_company_employee(company_id):
     """Add a new employee for a company"""
-    try:
-        data = request.json
-        
-        if not data:
-            raise BadRequest("No data provided")
-            
-        required_fields = ["full_name", "position"]
-        for field in required_fields:
-            if field not in data:
-                raise BadRequest(f"Missing required field: {field}")
-        
-        supabase = get_supabase_client()
-        
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise NotFound(f"Company with ID {company_id} not found")
-        
-        # Add company_id to data
-        data["company_id"] = company_id
-        
-        response = supabase.table("os_construction_employees").insert(data).execute()
-        
-        return jsonify(response.data[0]), 201
-    except Exception as e:
-        app.logger.error(f"Error adding employee for company {company_id}: {e}")
-        raise
+    data = validate_body(EmployeeCreate)
+    
+    response = insert_company_child("os_construction_employees", company_id, data)
+    
+    return created_response(data, response)
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    # Development server only - production runs under gunicorn (see gunicorn.conf.py)
+    app.run(debug=os.environ.get("FLASK_DEBUG") == "1", threaded=True)
\ No newline at end of file
@@ -1,11 +1,16 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, g
 import os
+import hmac
+import queue
+import atexit
 import datetime
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from flask_cors import CORS
+from flask_caching import Cache
+from postgrest.exceptions import APIError
 from pydantic import ValidationError as PydanticValidationError
 
 # Import custom modules
@@ -15,12 +20,16 @@ from exceptions import (OSConstructionError, DatabaseConnectionError,
                        ResourceNotFoundError, ValidationError, 
                        AuthenticationError, AuthorizationError)
 from models import (CompanyCreate, CompanyUpdate, ServiceCreate, 
-                  ProjectCreate, EmployeeCreate, PaginatedResponse)
+                  ProjectCreate, EmployeeCreate, PaginatedResponse,
+                  ProjectListQuery, PROJECT_STATUSES)
 from authentication import token_required, admin_required, generate_token
+from json_provider import ORJSONProvider
+from pagination import decode_cursor, fetch_offset_page, keyset_paginate, split_page
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(get_config())
+app.json = ORJSONProvider(app)
 
 # Setup CORS
 CORS(app, resources={r"/api/*": {"origins": "*"}})
@@ -30,18 +39,28 @@ limiter = Limiter(
     get_remote_address,
     app=app,
     default_limits=[app.config.get('RATELIMIT_DEFAULT')],
-    storage_uri=app.config.get('RATELIMIT_STORAGE_URL')
+    storage_uri=app.config.get('RATELIMIT_STORAGE_URL'),
+    storage_options=app.config.get('RATELIMIT_STORAGE_OPTIONS', {}),
+    strategy=app.config.get('RATELIMIT_STRATEGY')
 )
 
+# Response cache, configured by the CACHE_* settings in config.py
+cache = Cache(app)
+
 # Configure logging
 def setup_logging():
+    """Send app.logger records to a rotating log file without blocking requests.
+    
+    Handlers only enqueue records; a background QueueListener thread does the
+    file writes and rotation.
+    """
     if not os.path.exists('logs'):
         os.mkdir('logs')
         
     file_handler = RotatingFileHandler(
         app.config.get('LOG_FILE'), 
-        maxBytes=10240, 
-        backupCount=10
+        maxBytes=10 * 1024 * 1024, 
+        backupCount=5
     )
     file_handler.setFormatter(logging.Formatter(
         '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
@@ -50,7 +69,14 @@ def setup_logging():
     log_level = getattr(logging, app.config.get('LOG_LEVEL', 'INFO'))
     file_handler.setLevel(log_level)
     
-    app.logger.addHandler(file_handler)
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    
+    # Flush whatever is still queued on shutdown
+    atexit.register(listener.stop)
+    
+    app.logger.addHandler(QueueHandler(log_queue))
     app.logger.setLevel(log_level)
     app.logger.info('Application startup')
 
@@ -78,28 +104,138 @@ def handle_generic_exception(e):
     return jsonify({"error": "Internal Server Error", "message": "An unexpected error occurred"}), 500
 
 # Helper functions
-def get_pagination_params():
-    """Extract pagination parameters from request."""
+
+def require_company(company_id):
+    """Raise ResourceNotFoundError unless the company exists.
+    
+    Only needed to tell an unknown company apart from one with no rows, so
+    callers run it after the data query comes back empty. The answer comes
+    from fetch_company's memoized row, so repeat checks skip Supabase.
+    """
+    if fetch_company(company_id) is None:
+        raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+
+@cache.memoize()
+def fetch_company(company_id):
+    """Return a company row, or None if it doesn't exist.
+    
+    Memoized for CACHE_DEFAULT_TIMEOUT when REDIS_URL configures a shared
+    cache (otherwise the cache is a NullCache); update_company and
+    delete_company drop the entry. Misses (None) are not cached.
+    """
+    supabase = get_supabase_client()
+    response = supabase.table("os_construction").select("*").eq("id", company_id).maybe_single().execute()
+    return response.data if response else None
+
+# Postgres SQLSTATE raised when company_id does not reference an existing company
+FOREIGN_KEY_VIOLATION = "23503"
+
+def insert_company_child(supabase, table, company_id, db_data):
+    """Insert a row that belongs to a company.
+    
+    The company_id foreign key does the existence check, so a missing
+    company costs no extra round-trip.
+    """
     try:
-        page = max(1, int(request.args.get('page', 1)))
-        per_page = max(1, min(100, int(request.args.get('per_page', 10))))
-        return page, per_page
+        return supabase.table(table).insert(db_data).execute()
+    except APIError as e:
+        if e.code == FOREIGN_KEY_VIOLATION:
+            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+        raise
+
+def validation_error_message(e):
+    """Flatten a Pydantic ValidationError into one message.
+    
+    Each error is reported with its full field path, not just the
+    top-level key, so nested fields are named precisely.
+    """
+    return "Invalid data: " + "; ".join(
+        f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err['loc'] else err['msg']
+        for err in e.errors()
+    )
+
+def parse_body(model):
+    """Validate the JSON request body with a Pydantic model.
+    
+    The raw bytes go straight to pydantic-core (model_validate_json), so the
+    body is never built into an intermediate dict first.
+    """
+    if not request.is_json:
+        raise ValidationError("Request body must be JSON")
+    body = request.get_data(cache=False)
+    if not body.strip():
+        raise ValidationError("No data provided")
+    parsed = model.model_validate_json(body)
+    if not parsed.model_fields_set:
+        raise ValidationError("No data provided")
+    return parsed
+
+def get_pagination_params(args=None):
+    """Extract pagination parameters from request.
+    
+    The parsed (page, per_page) pair is kept on g.pagination, so later
+    calls in the same request reuse it instead of parsing the args again.
+    """
+    if args is None:
+        if "pagination" in g:
+            return g.pagination
+        args = request.args
+    try:
+        page = int(args.get('page', 1))
+        per_page = int(args.get('per_page', 10))
     except (ValueError, TypeError):
         raise ValidationError("Invalid pagination parameters")
+    pagination = (page if page >= 1 else 1,
+                  100 if per_page > 100 else (per_page if per_page >= 1 else 1))
+    if args is request.args:
+        g.pagination = pagination
+    return pagination
+
+def utc_now_iso():
+    """Current time as a timezone-aware ISO 8601 string.
+    
+    Only needed where Postgres can't fill the value in: created_at and
+    updated_at default to NOW() on insert, and the set_updated_at trigger
+    stamps updated_at on update, so writes leave them out.
+    """
+    return datetime.datetime.now(datetime.timezone.utc).isoformat()
 
-def paginate_query(query, page, per_page):
-    """Apply pagination to a Supabase query."""
-    offset = (page - 1) * per_page
-    return query.range(offset, offset + per_page - 1)
+def list_count_mode():
+    """Count to request with a list query.
+    
+    Offset pages report an exact total; cursor pages skip the count, since
+    counting every matching row would undo the point of keyset pagination.
+    """
+    return None if "cursor" in request.args else "exact"
 
-def get_total_count(supabase, table):
-    """Get total count of records in a table."""
+def fetch_page(query, page, per_page):
+    """Execute a list query for the requested page.
+    
+    ?cursor= switches to keyset pagination (empty for the first page) and
+    returns next_cursor instead of page totals; otherwise page/per_page
+    offsets are used.
+    
+    Returns:
+        tuple: (rows, response body)
+    """
+    if "cursor" not in request.args:
+        rows, total = fetch_offset_page(query, page, per_page)
+        return rows, format_paginated_response(rows, page, per_page, total)
+    
     try:
-        response = supabase.table(table).select("count", count="exact").execute()
-        return response.count if hasattr(response, 'count') else 0
-    except Exception as e:
-        app.logger.error(f"Error getting count from {table}: {e}")
-        return 0
+        after = decode_cursor(request.args["cursor"])
+    except ValueError:
+        raise ValidationError("Invalid cursor")
+    
+    response = keyset_paginate(query, after, per_page).execute()
+    rows, next_cursor = split_page(response.data, per_page)
+    return rows, {
+        "data": rows,
+        "pagination": {
+            "per_page": per_page,
+            "next_cursor": next_cursor
+        }
+    }
 
 def format_paginated_response(data, page, per_page, total):
     """Format a paginated response."""
@@ -113,6 +249,53 @@ def format_paginated_response(data, page, per_page, total):
         }
     }
 
+# Rows serialized per chunk when streaming a page; one write per row would
+# cost more in socket calls than it saves in memory
+STREAM_BATCH_ROWS = 25
+
+def stream_paginated(body):
+    """Stream a paginated body instead of encoding it in one piece.
+    
+    Rows are encoded a batch at a time, so the full JSON document never sits
+    in memory and the first bytes go out while later rows are still being
+    serialized (under gevent, other requests run between chunks).
+    """
+    encode = app.json.encode
+    rows = body["data"]
+    extra = {key: value for key, value in body.items() if key != "data"}
+    
+    def generate():
+        yield b'{"data":['
+        for start in range(0, len(rows), STREAM_BATCH_ROWS):
+            if start:
+                yield b','
+            yield b','.join(map(encode, rows[start:start + STREAM_BATCH_ROWS]))
+        yield b']'
+        for key, value in extra.items():
+            yield b',' + encode(key) + b':' + encode(value)
+        yield b'}'
+    
+    return Response(generate(), mimetype=app.json.mimetype)
+
+@app.after_request
+def add_conditional_headers(response):
+    """Tag successful reads with an ETag and answer matching If-None-Match with 304.
+    
+    A client re-reading an unchanged company gets an empty 304 instead of
+    the body. Streamed listings are left alone: hashing them would mean
+    buffering the whole page. Clients revalidate every time (no-cache), so
+    a write is never hidden behind a max-age.
+    """
+    if request.method == "GET" and response.status_code == 200 and not response.is_streamed:
+        response.add_etag()
+        response.headers["Cache-Control"] = "private, no-cache"
+        response.make_conditional(request)
+    return response
+
+# Demo credentials, encoded once for constant-time comparison in login()
+DEMO_USERNAME = b"admin"
+DEMO_PASSWORD = b"password"
+
 # Auth routes
 @app.route("/api/auth/login", methods=["POST"])
 @limiter.limit("10 per minute")
@@ -133,7 +316,10 @@ def login():
         
         # For demo purposes, we're using hardcoded credentials
         # In a real app, you would verify against your database
-        if data.get('username') == 'admin' and data.get('password') == 'password':
+        # Both checks always run (bitwise &), so timing doesn't reveal which one failed
+        username_ok = hmac.compare_digest(str(data.get('username')).encode(), DEMO_USERNAME)
+        password_ok = hmac.compare_digest(str(data.get('password')).encode(), DEMO_PASSWORD)
+        if username_ok & password_ok:
             # Generate JWT token
             token = generate_token(
                 user_id="admin-user-id",
@@ -162,14 +348,15 @@ def login():
 def health_check():
     """Health check endpoint for monitoring."""
     try:
-        # Check database connection
+        # Check database connection with a one-row read; an exact count
+        # would scan the whole table on every probe
         supabase = get_supabase_client()
-        supabase.table("os_construction").select("count", count="exact").limit(1).execute()
+        supabase.table("os_construction").select("id").limit(1).execute()
         
         return jsonify({
             "status": "healthy",
             "database": "connected",
-            "timestamp": datetime.datetime.utcnow().isoformat(),
+            "timestamp": utc_now_iso(),
             "environment": os.environ.get('FLASK_ENV', 'default')
         })
     except Exception as e:
@@ -177,7 +364,7 @@ def health_check():
         return jsonify({
             "status": "unhealthy",
             "error": str(e),
-            "timestamp": datetime.datetime.utcnow().isoformat(),
+            "timestamp": utc_now_iso(),
             "environment": os.environ.get('FLASK_ENV', 'default')
         }), 500
 
@@ -192,31 +379,40 @@ def get_companies():
         # Get filter parameters
         is_verified = request.args.get('is_verified')
         name_search = request.args.get('name')
+        is_verified_bool = is_verified.lower() == 'true' if is_verified is not None else None
         
         # Initialize Supabase client
         supabase = get_supabase_client()
+        
+        if "cursor" not in request.args:
+            # Offset pages: list_companies returns the page and its filtered
+            # total from a single SQL statement
+            response = supabase.rpc("list_companies", {
+                "p_page": page,
+                "p_per_page": per_page,
+                "p_name": name_search or None,
+                "p_is_verified": is_verified_bool
+            }).execute()
+            
+            listing = response.data[0]
+            result = format_paginated_response(listing["data"], page, per_page, listing["total"])
+            return stream_paginated(result)
+        
         query = supabase.table("os_construction").select("*")
         
         # Apply filters if provided
-        if is_verified is not None:
-            is_verified_bool = is_verified.lower() == 'true'
+        if is_verified_bool is not None:
             query = query.eq("is_verified", is_verified_bool)
             
+        # Substring match, served by the pg_trgm index on company_name
         if name_search:
             query = query.ilike("company_name", f"%{name_search}%")
         
-        # Get total count for pagination metadata
-        total_count = get_total_count(supabase, "os_construction")
-        
-        # Apply pagination
-        query = paginate_query(query, page, per_page)
+        # Execute the query for the requested page
+        _, result = fetch_page(query, page, per_page)
         
-        # Execute the query
-        response = query.execute()
-        
-        # Format and return the response
-        result = format_paginated_response(response.data, page, per_page, total_count)
-        return jsonify(result)
+        # Return the formatted response
+        return stream_paginated(result)
         
     except Exception as e:
         app.logger.error(f"Error fetching companies: {e}")
@@ -228,13 +424,12 @@ def get_companies():
 def get_company(company_id):
     """Get a specific company by ID."""
     try:
-        supabase = get_supabase_client()
-        response = supabase.table("os_construction").select("*").eq("id", company_id).execute()
+        company = fetch_company(company_id)
         
-        if not response.data:
+        if company is None:
             raise ResourceNotFoundError(f"Company with ID {company_id} not found")
             
-        return jsonify(response.data[0])
+        return jsonify(company)
     except Exception as e:
         app.logger.error(f"Error fetching company {company_id}: {e}")
         if isinstance(e, OSConstructionError):
@@ -247,21 +442,11 @@ def get_company(company_id):
 def create_company():
     """Create a new company with validated data."""
     try:
-        # Parse and validate input data
-        data = request.json
-        if not data:
-            raise ValidationError("No data provided")
-        
-        # Validate with Pydantic model
-        company_data = CompanyCreate(**data)
+        # Parse and validate input data with Pydantic model
+        company_data = parse_body(CompanyCreate)
         
-        # Convert to dict for inserting to database
-        db_data = company_data.dict()
-        
-        # Add timestamps
-        now = datetime.datetime.utcnow().isoformat()
-        db_data["created_at"] = now
-        db_data["updated_at"] = now
+        # Convert to a JSON-ready dict for inserting to database
+        db_data = company_data.model_dump(mode="json", exclude_none=True)
         
         # Insert into database
         supabase = get_supabase_client()
@@ -273,10 +458,7 @@ def create_company():
         return jsonify(response.data[0]), 201
         
     except PydanticValidationError as e:
-        # Convert Pydantic validation error to our custom error
-        errors = e.errors()
-        error_messages = [f"{err['loc'][0]}: {err['msg']}" for err in errors]
-        raise ValidationError(f"Invalid data: {'; '.join(error_messages)}")
+        raise ValidationError(validation_error_message(e))
         
     except Exception as e:
         app.logger.error(f"Error creating company: {e}")
@@ -289,37 +471,25 @@ def create_company():
 def update_company(company_id):
     """Update an existing company."""
     try:
-        data = request.json
-        if not data:
-            raise ValidationError("No data provided")
-            
         # Validate with Pydantic model - partial update allowed
-        company_data = CompanyUpdate(**data)
+        company_data = parse_body(CompanyUpdate)
         
-        # Convert to dict and remove None values
-        db_data = {k: v for k, v in company_data.dict().items() if v is not None}
-        
-        # Add updated timestamp
-        db_data["updated_at"] = datetime.datetime.utcnow().isoformat()
+        # Convert to a JSON-ready dict without the fields left as None
+        db_data = company_data.model_dump(mode="json", exclude_none=True)
         
         supabase = get_supabase_client()
         
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-        
+        # An update that matches no rows means the company doesn't exist
         response = supabase.table("os_construction").update(db_data).eq("id", company_id).execute()
         
         if not response.data:
-            raise DatabaseConnectionError("Failed to update company")
-            
+            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+        
+        cache.delete_memoized(fetch_company, company_id)
         return jsonify(response.data[0])
         
     except PydanticValidationError as e:
-        errors = e.errors()
-        error_messages = [f"{err['loc'][0]}: {err['msg']}" for err in errors]
-        raise ValidationError(f"Invalid data: {'; '.join(error_messages)}")
+        raise ValidationError(validation_error_message(e))
         
     except Exception as e:
         app.logger.error(f"Error updating company {company_id}: {e}")
@@ -335,17 +505,15 @@ def delete_company(company_id):
     try:
         supabase = get_supabase_client()
         
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-        
-        # Delete the company - this will cascade delete related records
+        # Delete the company - this will cascade delete related records.
+        # The removed rows are returned, so an empty result means it didn't exist
         response = supabase.table("os_construction").delete().eq("id", company_id).execute()
         
         if not response.data:
-            raise DatabaseConnectionError("Failed to delete company")
-            
+            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+        
+        cache.delete_memoized(fetch_company, company_id)
+        cache.delete_memoized(fetch_projects_page)
         return jsonify({"message": f"Company with ID {company_id} deleted successfully"}), 200
     except Exception as e:
         app.logger.error(f"Error deleting company {company_id}: {e}")
@@ -363,22 +531,16 @@ def get_company_services(company_id):
         
         supabase = get_supabase_client()
         
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-        
-        # Get total count
-        total_count = get_total_count(supabase, "os_construction_services")
+        # For offset pages the exact total comes back in Content-Range with the page itself
+        query = supabase.table("os_construction_services").select("*", count=list_count_mode()).eq("company_id", company_id)
+        rows, result = fetch_page(query, page, per_page)
         
-        # Execute query with pagination
-        query = supabase.table("os_construction_services").select("*").eq("company_id", company_id)
-        query = paginate_query(query, page, per_page)
-        response = query.execute()
+        # An empty page is either a company without services or an unknown company
+        if not rows:
+            require_company(company_id)
         
-        # Format and return response
-        result = format_paginated_response(response.data, page, per_page, total_count)
-        return jsonify(result)
+        # Return the formatted response
+        return stream_paginated(result)
         
     except Exception as e:
         app.logger.error(f"Error fetching services for company {company_id}: {e}")
@@ -391,31 +553,16 @@ def get_company_services(company_id):
 def add_company_service(company_id):
     """Add a new service for a company."""
     try:
-        # Parse and validate input data
-        data = request.json
-        if not data:
-            raise ValidationError("No data provided")
-        
-        # Validate with Pydantic model
-        service_data = ServiceCreate(**data)
-        
-        # Check if company exists
-        supabase = get_supabase_client()
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+        # Parse and validate input data with Pydantic model
+        service_data = parse_body(ServiceCreate)
         
         # Prepare data for database
-        db_data = service_data.dict()
+        db_data = service_data.model_dump(mode="json", exclude_none=True)
         db_data["company_id"] = company_id
         
-        # Add timestamps
-        now = datetime.datetime.utcnow().isoformat()
-        db_data["created_at"] = now
-        db_data["updated_at"] = now
-        
         # Insert into database
-        response = supabase.table("os_construction_services").insert(db_data).execute()
+        supabase = get_supabase_client()
+        response = insert_company_child(supabase, "os_construction_services", company_id, db_data)
         
         if not response.data:
             raise DatabaseConnectionError("Failed to create service")
@@ -423,9 +570,7 @@ def add_company_service(company_id):
         return jsonify(response.data[0]), 201
         
     except PydanticValidationError as e:
-        errors = e.errors()
-        error_messages = [f"{err['loc'][0]}: {err['msg']}" for err in errors]
-        raise ValidationError(f"Invalid data: {'; '.join(error_messages)}")
+        raise ValidationError(validation_error_message(e))
         
     except Exception as e:
         app.logger.error(f"Error adding service for company {company_id}: {e}")
@@ -434,6 +579,36 @@ def add_company_service(company_id):
         raise DatabaseConnectionError(f"Failed to add service: {str(e)}")
 
 # Project endpoints
+
+# Seconds an offset page of a company's projects stays cached
+PROJECTS_CACHE_TIMEOUT = 60
+
+def projects_query(company_id, status):
+    """Select a company's projects, optionally with one status.
+    
+    Offset pages get the exact (filtered) total back in Content-Range.
+    """
+    query = (get_supabase_client().table("os_construction_projects")
+             .select("*", count=list_count_mode()).eq("company_id", company_id))
+    if status:
+        query = query.eq("status", status)
+    return query
+
+@cache.memoize(timeout=PROJECTS_CACHE_TIMEOUT)
+def fetch_projects_page(company_id, status, page, per_page):
+    """Return the response body for an offset page of a company's projects.
+    
+    Memoized for PROJECTS_CACHE_TIMEOUT only when REDIS_URL configures a
+    shared cache, so every worker sees the invalidation; adding a project or
+    deleting a company drops every cached page. Project writes are rare next to reads,
+    so that is cheaper than tracking keys per company. An unknown company
+    raises and is not cached.
+    """
+    rows, result = fetch_page(projects_query(company_id, status), page, per_page)
+    if not rows:
+        require_company(company_id)
+    return result
+
 @app.route("/api/companies/<company_id>/projects", methods=["GET"])
 def get_company_projects(company_id):
     """Get all projects for a company with pagination and filtering."""
@@ -441,36 +616,24 @@ def get_company_projects(company_id):
         # Get pagination parameters
         page, per_page = get_pagination_params()
         
-        # Get filter parameters
-        status = request.args.get("status")
-        
-        supabase = get_supabase_client()
-        
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-        
-        # Build query
-        query = supabase.table("os_construction_projects").select("*").eq("company_id", company_id)
+        # Get filter parameters; an empty ?status= means no filter, as before
+        try:
+            status = ProjectListQuery.model_validate({"status": request.args.get("status") or None}).status
+        except PydanticValidationError:
+            raise ValidationError(f"Invalid status. Must be one of {list(PROJECT_STATUSES)}")
         
-        if status:
-            valid_statuses = ['planned', 'in_progress', 'completed', 'cancelled', 'on_hold']
-            if status not in valid_statuses:
-                raise ValidationError(f"Invalid status. Must be one of {valid_statuses}")
-            query = query.eq("status", status)
+        # Offset pages are served from the cache; cursor pages are not cached
+        if "cursor" not in request.args:
+            return stream_paginated(fetch_projects_page(company_id, status, page, per_page))
         
-        # Get total count (filtered)
-        total_response = query.execute()
-        total_count = len(total_response.data)
+        rows, result = fetch_page(projects_query(company_id, status), page, per_page)
         
-        # Apply pagination
-        query = paginate_query(query, page, per_page)
-        response = query.execute()
+        # An empty page is either a company without projects or an unknown company
+        if not rows:
+            require_company(company_id)
         
-        # Format and return response
-        result = format_paginated_response(response.data, page, per_page, total_count)
-        return jsonify(result)
+        # Return the formatted response
+        return stream_paginated(result)
         
     except Exception as e:
         app.logger.error(f"Error fetching projects for company {company_id}: {e}")
@@ -483,47 +646,25 @@ def get_company_projects(company_id):
 def add_company_project(company_id):
     """Add a new project for a company."""
     try:
-        # Parse and validate input data
-        data = request.json
-        if not data:
-            raise ValidationError("No data provided")
-        
-        # Validate with Pydantic model
-        project_data = ProjectCreate(**data)
-        
-        # Check if company exists
-        supabase = get_supabase_client()
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+        # Parse and validate input data with Pydantic model
+        project_data = parse_body(ProjectCreate)
         
-        # Prepare data for database
-        db_data = project_data.dict()
+        # Prepare data for database - mode="json" renders the dates as ISO strings
+        db_data = project_data.model_dump(mode="json", exclude_none=True)
         db_data["company_id"] = company_id
         
-        # Handle date fields - convert to ISO format strings if present
-        if db_data.get("start_date"):
-            db_data["start_date"] = db_data["start_date"].isoformat()
-        if db_data.get("end_date"):
-            db_data["end_date"] = db_data["end_date"].isoformat()
-        
-        # Add timestamps
-        now = datetime.datetime.utcnow().isoformat()
-        db_data["created_at"] = now
-        db_data["updated_at"] = now
-        
         # Insert into database
-        response = supabase.table("os_construction_projects").insert(db_data).execute()
+        supabase = get_supabase_client()
+        response = insert_company_child(supabase, "os_construction_projects", company_id, db_data)
         
         if not response.data:
             raise DatabaseConnectionError("Failed to create project")
-            
+        
+        cache.delete_memoized(fetch_projects_page)
         return jsonify(response.data[0]), 201
         
     except PydanticValidationError as e:
-        errors = e.errors()
-        error_messages = [f"{err['loc'][0]}: {err['msg']}" for err in errors]
-        raise ValidationError(f"Invalid data: {'; '.join(error_messages)}")
+        raise ValidationError(validation_error_message(e))
         
     except Exception as e:
         app.logger.error(f"Error adding project for company {company_id}: {e}")
@@ -541,24 +682,16 @@ def get_company_employees(company_id):
         
         supabase = get_supabase_client()
         
-        # First, check if company exists
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-        
-        # Get total count
-        query = supabase.table("os_construction_employees").select("count", count="exact").eq("company_id", company_id)
-        count_response = query.execute()
-        total_count = count_response.count if hasattr(count_response, 'count') else 0
+        # For offset pages the exact total comes back in Content-Range with the page itself
+        query = supabase.table("os_construction_employees").select("*", count=list_count_mode()).eq("company_id", company_id)
+        rows, result = fetch_page(query, page, per_page)
         
-        # Execute query with pagination
-        query = supabase.table("os_construction_employees").select("*").eq("company_id", company_id)
-        query = paginate_query(query, page, per_page)
-        response = query.execute()
+        # An empty page is either a company without employees or an unknown company
+        if not rows:
+            require_company(company_id)
         
-        # Format and return response
-        result = format_paginated_response(response.data, page, per_page, total_count)
-        return jsonify(result)
+        # Return the formatted response
+        return stream_paginated(result)
         
     except Exception as e:
         app.logger.error(f"Error fetching employees for company {company_id}: {e}")
@@ -571,35 +704,16 @@ def get_company_employees(company_id):
 def add_company_employee(company_id):
     """Add a new employee for a company."""
     try:
-        # Parse and validate input data
-        data = request.json
-        if not data:
-            raise ValidationError("No data provided")
+        # Parse and validate input data with Pydantic model
+        employee_data = parse_body(EmployeeCreate)
         
-        # Validate with Pydantic model
-        employee_data = EmployeeCreate(**data)
-        
-        # Check if company exists
-        supabase = get_supabase_client()
-        check = supabase.table("os_construction").select("id").eq("id", company_id).execute()
-        if not check.data:
-            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-        
-        # Prepare data for database
-        db_data = employee_data.dict()
+        # Prepare data for database - mode="json" renders join_date as an ISO string
+        db_data = employee_data.model_dump(mode="json", exclude_none=True)
         db_data["company_id"] = company_id
         
-        # Handle date field - convert to ISO format string if present
-        if db_data.get("join_date"):
-            db_data["join_date"] = db_data["join_date"].isoformat()
-        
-        # Add timestamps
-        now = datetime.datetime.utcnow().isoformat()
-        db_data["created_at"] = now
-        db_data["updated_at"] = now
-        
         # Insert into database
-        response = supabase.table("os_construction_employees").insert(db_data).execute()
+        supabase = get_supabase_client()
+        response = insert_company_child(supabase, "os_construction_employees", company_id, db_data)
         
         if not response.data:
             raise DatabaseConnectionError("Failed to create employee")
@@ -607,9 +721,7 @@ def add_company_employee(company_id):
         return jsonify(response.data[0]), 201
         
     except PydanticValidationError as e:
-        errors = e.errors()
-        error_messages = [f"{err['loc'][0]}: {err['msg']}" for err in errors]
-        raise ValidationError(f"Invalid data: {'; '.join(error_messages)}")
+        raise ValidationError(validation_error_message(e))
         
     except Exception as e:
         app.logger.error(f"Error adding employee for company {company_id}: {e}")
@@ -1,10 +1,19 @@
 import os
 import jwt
+import time
 import datetime
+import threading
 from functools import wraps
+from cachetools import TLRUCache
 from flask import request, jsonify, current_app
+from dotenv import load_dotenv
 from exceptions import AuthenticationError, AuthorizationError
 
+load_dotenv()
+
+# Admin user IDs, parsed once at import (comma-separated in ADMIN_USER_IDS)
+ADMIN_USER_IDS = frozenset(filter(None, os.environ.get('ADMIN_USER_IDS', '').split(',')))
+
 def generate_token(user_id, username, expiration=24):
     """Generate a JWT token for the given user.
     
@@ -29,9 +38,25 @@ def generate_token(user_id, username, expiration=24):
         algorithm='HS256'
     )
 
+# Maximum time a verified token is trusted without re-checking its signature
+TOKEN_CACHE_TTL = 60
+
+def _token_expiry(key, payload, now):
+    """Keep a decoded token for TOKEN_CACHE_TTL seconds, never past its own exp."""
+    return min(now + TOKEN_CACHE_TTL, payload['exp'])
+
+# Verified payloads keyed by (secret, token), so a client presenting the same
+# token repeatedly skips the HMAC check. Guarded by a lock (a gevent lock once
+# wsgi.py has monkey-patched threading).
+_token_cache = TLRUCache(maxsize=10_000, ttu=_token_expiry, timer=time.time)
+_token_cache_lock = threading.Lock()
+
 def decode_token(token):
     """Decode a JWT token.
     
+    Successfully verified tokens are cached for up to TOKEN_CACHE_TTL
+    seconds (bounded by their exp claim); failures are never cached.
+    
     Args:
         token (str): The JWT token to decode
     
@@ -41,16 +66,31 @@ def decode_token(token):
     Raises:
         AuthenticationError: If the token is invalid or expired
     """
+    secret = current_app.config.get('JWT_SECRET_KEY')
+    key = (secret, token)
+    
+    with _token_cache_lock:
+        payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
+    
     try:
-        return jwt.decode(
+        payload = jwt.decode(
             token,
-            current_app.config.get('JWT_SECRET_KEY'),
+            secret,
             algorithms=['HS256']
         )
     except jwt.ExpiredSignatureError:
         raise AuthenticationError('Token expired. Please log in again.')
     except jwt.InvalidTokenError:
         raise AuthenticationError('Invalid token. Please log in again.')
+    
+    # Tokens without an exp claim are valid forever, so don't cache those
+    if 'exp' in payload:
+        with _token_cache_lock:
+            _token_cache[key] = payload
+    
+    return payload
 
 def token_required(f):
     """Decorator to require a valid JWT token for a route.
@@ -111,10 +151,8 @@ def admin_required(f):
         # Assuming the token payload has a 'role' field
         # You could also check against a list of admin user IDs
         
-        # For demo purposes, we'll use a hardcoded list of admin user IDs
-        admin_user_ids = os.environ.get('ADMIN_USER_IDS', '').split(',')
-        
-        if not hasattr(request, 'user_id') or request.user_id not in admin_user_ids:
+        # For demo purposes, admins are the user IDs listed in ADMIN_USER_IDS
+        if getattr(request, 'user_id', None) not in ADMIN_USER_IDS:
             return jsonify({'error': 'Authorization failed', 'message': 'Admin privileges required'}), 403
         
         return f(*args, **kwargs)
@@ -1,9 +1,15 @@
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Rows read back from Supabase were validated when they were written, so
+# OSConstructionManager builds response models from them without validating
+# again. Set TRUSTED_DB_READS=0 to re-validate every row.
+TRUSTED_DB_READS = os.environ.get('TRUSTED_DB_READS', '1') != '0'
+
 
 class Config:
     """Base configuration."""
@@ -24,12 +30,20 @@ class Config:
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FILE = 'logs/app.log'
     
-    # Rate limiting
+    # Rate limiting - counters live in Redis when REDIS_URL is set, so every
+    # gunicorn worker enforces the same limit; otherwise each process counts alone
     RATELIMIT_DEFAULT = "200 per day;50 per hour"
-    RATELIMIT_STORAGE_URL = "memory://"
+    RATELIMIT_STORAGE_URL = os.environ.get('REDIS_URL', 'memory://')
+    RATELIMIT_STRATEGY = "moving-window"
+    RATELIMIT_STORAGE_OPTIONS = {"socket_keepalive": True}
     
-    # Cache settings
-    CACHE_TYPE = "SimpleCache"
+    # Cache settings - one Redis cache shared by every worker when REDIS_URL is
+    # set. Without it nothing is cached: a per-process cache would only be
+    # invalidated in the worker that handled a write, so the others would keep
+    # serving updated or deleted companies until the entries expired.
+    CACHE_TYPE = "RedisCache" if os.environ.get('REDIS_URL') else "NullCache"
+    CACHE_REDIS_URL = os.environ.get('REDIS_URL')
+    CACHE_KEY_PREFIX = "osc:"
     CACHE_DEFAULT_TIMEOUT = 300
 
 
@@ -66,9 +80,6 @@ class ProductionConfig(Config):
     # Stricter rate limits for production
     RATELIMIT_DEFAULT = "100 per day;20 per hour"
     
-    # Production caching (would use Redis or Memcached in a real app)
-    CACHE_TYPE = "SimpleCache"  # Change to "RedisCache" in real production
-    
     # Logging
     LOG_LEVEL = 'WARNING'
 
@@ -82,7 +93,12 @@ config = {
 }
 
 
+@lru_cache(maxsize=1)
 def get_config():
-    """Return the appropriate configuration object based on the environment."""
+    """Return the appropriate configuration object based on the environment.
+    
+    FLASK_ENV is read on the first call only; tests that switch environments
+    call get_config.cache_clear() first.
+    """
     env = os.environ.get('FLASK_ENV', 'default')
     return config.get(env, config['default'])
\ No newline at end of file
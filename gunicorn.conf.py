@@ -0,0 +1,38 @@
+import os
+import multiprocessing
+
+# Production server settings: gunicorn -c gunicorn.conf.py app:app
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Handlers spend nearly all their time waiting on PostgREST, so each process
+# runs a pool of threads rather than one request at a time
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2, 4)))
+
+# Threads per worker - kept well under SUPABASE_MAX_CONNECTIONS so requests
+# don't queue on the shared HTTP pool
+threads = int(os.environ.get("GUNICORN_THREADS", "16"))
+
+# Concurrent greenlets per worker when running with -k gevent (wsgi:app)
+worker_connections = int(os.environ.get("GUNICORN_WORKER_CONNECTIONS", "1000"))
+
+# Recycle workers periodically, staggered so they don't all restart at once
+max_requests = 500
+max_requests_jitter = 200
+
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+
+def child_exit(server, worker):
+    """Drop an exited worker's live gauge samples from /metrics.
+    
+    With PROMETHEUS_MULTIPROC_DIR set, every worker writes its samples to
+    files in that directory, which outlive the worker unless marked dead.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
\ No newline at end of file
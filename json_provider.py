@@ -0,0 +1,32 @@
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that serializes with orjson.
+
+    Used for jsonify() and request.json alike. orjson encodes in C straight to
+    bytes, so responses skip both the stdlib encoder and a str round-trip.
+    Types orjson doesn't know (Decimal, objects with __html__) fall back to
+    Flask's default handler.
+    """
+
+    # Naive datetimes in this codebase come from utcnow(), so label them UTC
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC
+
+    def encode(self, obj):
+        """Serialize obj to JSON bytes."""
+        return orjson.dumps(obj, default=self.default, option=self.option)
+
+    def dumps(self, obj, **kwargs):
+        return self.encode(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self.encode(obj),
+            mimetype=self.mimetype
+        )
\ No newline at end of file
@@ -0,0 +1,46 @@
+import time
+from flask import has_request_context, request
+from prometheus_client import Counter, Histogram
+
+# Per-route PostgREST call counts make N+1 regressions visible: any route whose
+# calls_total grows faster than its request count is making extra round-trips
+SUPABASE_CALLS = Counter(
+    "supabase_calls_total",
+    "PostgREST calls made, by Flask route and table",
+    ["route", "table"]
+)
+SUPABASE_CALL_SECONDS = Histogram(
+    "supabase_call_seconds",
+    "PostgREST call latency in seconds, by Flask route and table",
+    ["route", "table"]
+)
+
+
+def _labels(http_request):
+    """Route and table labels for a PostgREST request.
+
+    The table (or rpc/<function>) is taken from the URL path after /rest/v1/.
+    Calls made outside a Flask request (scripts, the manager) are labelled "-".
+    """
+    route = (request.endpoint or "-") if has_request_context() else "-"
+    table = http_request.url.path.split("/rest/v1/", 1)[-1] or "-"
+    return route, table
+
+
+def start_timer(http_request):
+    """httpx request hook: stamp the request with its start time."""
+    http_request.extensions["started_at"] = time.perf_counter()
+
+
+def record_call(http_response):
+    """httpx response hook: count the call and observe its latency."""
+    http_request = http_response.request
+    route, table = _labels(http_request)
+    SUPABASE_CALLS.labels(route, table).inc()
+    SUPABASE_CALL_SECONDS.labels(route, table).observe(
+        time.perf_counter() - http_request.extensions["started_at"]
+    )
+
+
+# Passed to the PostgREST session so every .execute() is measured
+EVENT_HOOKS = {"request": [start_timer], "response": [record_call]}
\ No newline at end of file
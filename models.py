@@ -1,58 +1,85 @@
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List
+from __future__ import annotations
+
+from functools import lru_cache
+from pydantic import AfterValidator, BaseModel, ConfigDict, TypeAdapter, Field, ValidationInfo, field_validator
+from pydantic.networks import validate_email
+from typing import Annotated, Generic, Literal, TypeVar, get_args
 from datetime import date, datetime
 
 
+# Project lifecycle states, checked by pydantic-core wherever a status is accepted
+ProjectStatus = Literal['planned', 'in_progress', 'completed', 'cancelled', 'on_hold']
+PROJECT_STATUSES = get_args(ProjectStatus)
+VALID_PROJECT_STATUSES = frozenset(PROJECT_STATUSES)
+
+# Bounds for founded_year, checked by pydantic-core. The upper bound is the
+# year at import; gunicorn recycles workers (max_requests), so it keeps up.
+MIN_FOUNDED_YEAR = 1800
+MAX_FOUNDED_YEAR = datetime.now().year
+
+@lru_cache(maxsize=10_000)
+def _validate_email_cached(value: str) -> str:
+    """Validate and normalize an email address, memoized per address.
+    
+    Same check as EmailStr (email-validator, no DNS lookups), but repeated
+    addresses - an update storm on one company, a bulk import with shared
+    contacts - skip the parser. Invalid addresses raise and are not cached.
+    """
+    return validate_email(value)[1]
+
+
+# Drop-in replacement for EmailStr
+CachedEmail = Annotated[str, AfterValidator(_validate_email_cached)]
+
+# Shared by the *Response models, which are built from rows Supabase returns:
+# they can be read from attribute-style objects, nested model instances are
+# reused as-is rather than revalidated, unknown columns are dropped, and
+# instances are read-only (use model_copy(update=...) to derive a changed one).
+RESPONSE_MODEL_CONFIG = ConfigDict(
+    frozen=True,
+    from_attributes=True,
+    revalidate_instances='never',
+    validate_assignment=False,
+    extra='ignore'
+)
+
+
 class CompanyBase(BaseModel):
     """Base model for company data with validation."""
     company_name: str = Field(..., min_length=1, max_length=255)
     company_address: str
-    company_email: EmailStr
+    company_email: CachedEmail
     company_phone: str = Field(..., min_length=5, max_length=50)
 
 
 class CompanyCreate(CompanyBase):
     """Model for creating a new company."""
-    website: Optional[str] = None
-    description: Optional[str] = None
-    founded_year: Optional[int] = None
+    website: str | None = None
+    description: str | None = None
+    founded_year: int | None = Field(None, ge=MIN_FOUNDED_YEAR, le=MAX_FOUNDED_YEAR)
     is_verified: bool = False
 
-    @validator('founded_year')
-    def validate_founded_year(cls, v):
-        if v is not None:
-            current_year = datetime.now().year
-            if v < 1800 or v > current_year:
-                raise ValueError(f'Founded year must be between 1800 and {current_year}')
-        return v
-
 
 class CompanyUpdate(BaseModel):
     """Model for updating an existing company."""
-    company_name: Optional[str] = Field(None, min_length=1, max_length=255)
-    company_address: Optional[str] = None
-    company_email: Optional[EmailStr] = None
-    company_phone: Optional[str] = Field(None, min_length=5, max_length=50)
-    website: Optional[str] = None
-    description: Optional[str] = None
-    founded_year: Optional[int] = None
-    is_verified: Optional[bool] = None
-
-    @validator('founded_year')
-    def validate_founded_year(cls, v):
-        if v is not None:
-            current_year = datetime.now().year
-            if v < 1800 or v > current_year:
-                raise ValueError(f'Founded year must be between 1800 and {current_year}')
-        return v
+    company_name: str | None = Field(None, min_length=1, max_length=255)
+    company_address: str | None = None
+    company_email: CachedEmail | None = None
+    company_phone: str | None = Field(None, min_length=5, max_length=50)
+    website: str | None = None
+    description: str | None = None
+    founded_year: int | None = Field(None, ge=MIN_FOUNDED_YEAR, le=MAX_FOUNDED_YEAR)
+    is_verified: bool | None = None
 
 
 class CompanyResponse(CompanyBase):
     """Model for company response data."""
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
-    website: Optional[str] = None
-    description: Optional[str] = None
-    founded_year: Optional[int] = None
+    website: str | None = None
+    description: str | None = None
+    founded_year: int | None = None
     is_verified: bool
     created_at: datetime
     updated_at: datetime
@@ -61,9 +88,9 @@ class CompanyResponse(CompanyBase):
 class ServiceBase(BaseModel):
     """Base model for service data with validation."""
     service_name: str = Field(..., min_length=1, max_length=255)
-    description: Optional[str] = None
+    description: str | None = None
     is_free: bool = True
-    eligibility_criteria: Optional[str] = None
+    eligibility_criteria: str | None = None
 
 
 class ServiceCreate(ServiceBase):
@@ -73,14 +100,16 @@ class ServiceCreate(ServiceBase):
 
 class ServiceUpdate(BaseModel):
     """Model for updating an existing service."""
-    service_name: Optional[str] = Field(None, min_length=1, max_length=255)
-    description: Optional[str] = None
-    is_free: Optional[bool] = None
-    eligibility_criteria: Optional[str] = None
+    service_name: str | None = Field(None, min_length=1, max_length=255)
+    description: str | None = None
+    is_free: bool | None = None
+    eligibility_criteria: str | None = None
 
 
 class ServiceResponse(ServiceBase):
     """Model for service response data."""
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     company_id: str
     created_at: datetime
@@ -91,25 +120,21 @@ class ProjectBase(BaseModel):
     """Base model for project data with validation."""
     project_name: str = Field(..., min_length=1, max_length=255)
     location: str
-    start_date: Optional[date] = None
-    end_date: Optional[date] = None
-    status: str = "planned"
-    description: Optional[str] = None
-    beneficiary_info: Optional[str] = None
-
-    @validator('end_date')
-    def validate_end_date(cls, v, values):
-        if v and 'start_date' in values and values['start_date'] and v < values['start_date']:
+    start_date: date | None = None
+    end_date: date | None = None
+    status: ProjectStatus = "planned"
+    description: str | None = None
+    beneficiary_info: str | None = None
+
+    @field_validator('end_date')
+    @classmethod
+    def validate_end_date(cls, v, info: ValidationInfo):
+        # start_date is declared first, so it is already in info.data when valid
+        start_date = info.data.get('start_date')
+        if v and start_date and v < start_date:
             raise ValueError('End date must be after start date')
         return v
 
-    @validator('status')
-    def validate_status(cls, v):
-        valid_statuses = ['planned', 'in_progress', 'completed', 'cancelled', 'on_hold']
-        if v not in valid_statuses:
-            raise ValueError(f'Status must be one of {valid_statuses}')
-        return v
-
 
 class ProjectCreate(ProjectBase):
     """Model for creating a new project."""
@@ -118,31 +143,33 @@ class ProjectCreate(ProjectBase):
 
 class ProjectUpdate(BaseModel):
     """Model for updating an existing project."""
-    project_name: Optional[str] = Field(None, min_length=1, max_length=255)
-    location: Optional[str] = None
-    start_date: Optional[date] = None
-    end_date: Optional[date] = None
-    status: Optional[str] = None
-    description: Optional[str] = None
-    beneficiary_info: Optional[str] = None
-
-    @validator('end_date')
-    def validate_end_date(cls, v, values):
-        if v and 'start_date' in values and values['start_date'] and v < values['start_date']:
+    project_name: str | None = Field(None, min_length=1, max_length=255)
+    location: str | None = None
+    start_date: date | None = None
+    end_date: date | None = None
+    status: ProjectStatus | None = None
+    description: str | None = None
+    beneficiary_info: str | None = None
+
+    @field_validator('end_date')
+    @classmethod
+    def validate_end_date(cls, v, info: ValidationInfo):
+        # start_date is declared first, so it is already in info.data when valid
+        start_date = info.data.get('start_date')
+        if v and start_date and v < start_date:
             raise ValueError('End date must be after start date')
         return v
 
-    @validator('status')
-    def validate_status(cls, v):
-        if v is not None:
-            valid_statuses = ['planned', 'in_progress', 'completed', 'cancelled', 'on_hold']
-            if v not in valid_statuses:
-                raise ValueError(f'Status must be one of {valid_statuses}')
-        return v
+
+class ProjectListQuery(BaseModel):
+    """Model for the query parameters of the project list endpoint."""
+    status: ProjectStatus | None = None
 
 
 class ProjectResponse(ProjectBase):
     """Model for project response data."""
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     company_id: str
     created_at: datetime
@@ -153,10 +180,10 @@ class EmployeeBase(BaseModel):
     """Base model for employee data with validation."""
     full_name: str = Field(..., min_length=1, max_length=255)
     position: str = Field(..., min_length=1, max_length=100)
-    email: Optional[EmailStr] = None
-    phone: Optional[str] = None
-    specialization: Optional[str] = None
-    join_date: Optional[date] = None
+    email: CachedEmail | None = None
+    phone: str | None = None
+    specialization: str | None = None
+    join_date: date | None = None
 
 
 class EmployeeCreate(EmployeeBase):
@@ -166,23 +193,59 @@ class EmployeeCreate(EmployeeBase):
 
 class EmployeeUpdate(BaseModel):
     """Model for updating an existing employee."""
-    full_name: Optional[str] = Field(None, min_length=1, max_length=255)
-    position: Optional[str] = Field(None, min_length=1, max_length=100)
-    email: Optional[EmailStr] = None
-    phone: Optional[str] = None
-    specialization: Optional[str] = None
-    join_date: Optional[date] = None
+    full_name: str | None = Field(None, min_length=1, max_length=255)
+    position: str | None = Field(None, min_length=1, max_length=100)
+    email: CachedEmail | None = None
+    phone: str | None = None
+    specialization: str | None = None
+    join_date: date | None = None
 
 
 class EmployeeResponse(EmployeeBase):
     """Model for employee response data."""
+    model_config = RESPONSE_MODEL_CONFIG
+
     id: str
     company_id: str
     created_at: datetime
     updated_at: datetime
 
 
-class PaginatedResponse(BaseModel):
-    """Generic model for paginated responses."""
-    data: List
-    pagination: dict
\ No newline at end of file
+class CompanyFullResponse(CompanyResponse):
+    """Model for a company with its services, projects and employees embedded."""
+    os_construction_services: list[ServiceResponse] = []
+    os_construction_projects: list[ProjectResponse] = []
+    os_construction_employees: list[EmployeeResponse] = []
+
+
+ResponseT = TypeVar('ResponseT', bound=BaseModel)
+
+
+class Pagination(BaseModel):
+    """Model for the pagination block of a list response.
+    
+    Offset pages fill page, total and pages; cursor pages fill next_cursor.
+    """
+    per_page: int
+    page: int | None = None
+    total: int | None = None
+    pages: int | None = None
+    next_cursor: str | None = None
+
+
+class PaginatedResponse(BaseModel, Generic[ResponseT]):
+    """Generic model for paginated responses, e.g. PaginatedResponse[CompanyResponse]."""
+    model_config = RESPONSE_MODEL_CONFIG
+
+    data: list[ResponseT]
+    pagination: Pagination
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model):
+    """Compiled validator for a list of model objects.
+    
+    Building a TypeAdapter compiles a validator, which costs far more than
+    using one, so each list type is built once per process.
+    """
+    return TypeAdapter(list[model])
\ No newline at end of file
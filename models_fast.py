@@ -0,0 +1,77 @@
+from datetime import date, datetime
+from typing import List, Optional
+
+import msgspec
+
+
+# msgspec mirrors of the *Response models for high-volume read paths. Rows
+# read back from Supabase were validated on write, so they only need typed
+# decoding, which msgspec does in C several times faster than a BaseModel.
+# The Pydantic models in models.py stay the write path (*Create/*Update).
+# Structs store fields in slots; they only hold scalars, so gc=False keeps
+# them out of the cyclic garbage collector.
+
+class CompanyResponseFast(msgspec.Struct, frozen=True, gc=False):
+    """Company row (see models.CompanyResponse)."""
+    id: str
+    company_name: str
+    company_address: str
+    company_email: str
+    company_phone: str
+    is_verified: bool
+    created_at: datetime
+    updated_at: datetime
+    website: Optional[str] = None
+    description: Optional[str] = None
+    founded_year: Optional[int] = None
+
+
+class ServiceResponseFast(msgspec.Struct, frozen=True, gc=False):
+    """Service row (see models.ServiceResponse)."""
+    id: str
+    company_id: str
+    service_name: str
+    created_at: datetime
+    updated_at: datetime
+    description: Optional[str] = None
+    is_free: bool = True
+    eligibility_criteria: Optional[str] = None
+
+
+class ProjectResponseFast(msgspec.Struct, frozen=True, gc=False):
+    """Project row (see models.ProjectResponse)."""
+    id: str
+    company_id: str
+    project_name: str
+    location: str
+    created_at: datetime
+    updated_at: datetime
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    status: str = "planned"
+    description: Optional[str] = None
+    beneficiary_info: Optional[str] = None
+
+
+class EmployeeResponseFast(msgspec.Struct, frozen=True, gc=False):
+    """Employee row (see models.EmployeeResponse)."""
+    id: str
+    company_id: str
+    full_name: str
+    position: str
+    created_at: datetime
+    updated_at: datetime
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    specialization: Optional[str] = None
+    join_date: Optional[date] = None
+
+
+def rows_to_structs(struct_cls, rows):
+    """Convert database rows (dicts) to a list of struct_cls instances."""
+    return msgspec.convert(rows, List[struct_cls])
+
+
+def encode_json(obj):
+    """Serialize structs (or lists of them) to JSON bytes."""
+    return msgspec.json.encode(obj)
\ No newline at end of file
@@ -1,151 +1,199 @@
-import os
-from typing import Dict, List, Optional, Any
-from datetime import datetime
-from osconstruction import create_client, Client
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from typing import Any, get_args
+from datetime import date, datetime
+import msgspec
+from pydantic import BaseModel, TypeAdapter
+
+from config import TRUSTED_DB_READS
+from models import list_adapter
+from models_fast import rows_to_structs
+from supabase_client import get_supabase_client
+
+# Parsers for the date and timestamp columns when validation is skipped.
+# pydantic's parser also accepts the trimmed fractional seconds Postgres
+# emits, which datetime.fromisoformat rejects before Python 3.11.
+_temporal_adapters = {datetime: TypeAdapter(datetime), date: TypeAdapter(date)}
+
+# Rows sent per bulk insert request
+BULK_INSERT_CHUNK_SIZE = 500
+
+# Rows sent per bulk upsert request; keeps seed/import payloads well under
+# PostgREST's request size limit
+BULK_UPSERT_CHUNK_SIZE = 1000
+
+# Runs the per-table reads of get_company_bundle side by side. The requests
+# share the client's HTTP/2 connection pool; under gevent these threads are
+# greenlets.
+_fanout_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="osc-fanout")
+
+
+@lru_cache(maxsize=None)
+def _temporal_fields(model_cls: type[BaseModel]) -> dict[str, TypeAdapter]:
+    """The date and datetime fields of a response model, with their parsers."""
+    fields = {}
+    for name, field in model_cls.model_fields.items():
+        kinds = (field.annotation, *get_args(field.annotation))
+        # datetime first: it is a subclass of date
+        for kind in (datetime, date):
+            if kind in kinds:
+                fields[name] = _temporal_adapters[kind]
+                break
+    return fields
+
+
+def _row_to_response(model_cls: type[BaseModel], row: dict[str, Any]) -> BaseModel:
+    """Build a response model from a database row.
+    
+    Reads are trusted, so the model is constructed without validation
+    (EmailStr and Field checks already ran on write); only the date and
+    timestamp columns are converted, and columns the model doesn't declare
+    are dropped as validation would. Writes (add_*, update_*) still go
+    through the *Create and *Update models with full validation.
+    """
+    if not TRUSTED_DB_READS:
+        return model_cls.model_validate(row)
+    
+    fields = model_cls.model_fields
+    row = {name: value for name, value in row.items() if name in fields}
+    for name, adapter in _temporal_fields(model_cls).items():
+        if isinstance(row.get(name), str):
+            row[name] = adapter.validate_python(row[name])
+    return model_cls.model_construct(**row)
+
 
 class OSConstructionManager:
-    def __init__(self):
-        self.supabase = self._initialize_supabase()
-        
-    def _initialize_supabase(self) -> Client:
-        """Initialize the Supabase client."""
-        supabase_url = os.environ.get("SUPABASE_URL")
-        supabase_key = os.environ.get("SUPABASE_KEY")
-        
-        if not supabase_url or not supabase_key:
-            raise ValueError("Missing Supabase credentials. Set SUPABASE_URL and SUPABASE_KEY environment variables.")
-        
-        return create_client(supabase_url, supabase_key)
+    @property
+    def supabase(self):
+        # Process-wide client, created on first use: managers share one
+        # connection pool and constructing one is free
+        # (reset_supabase_client() replaces it for all of them and closes
+        # the old pool once requests on it are done; with
+        # SUPABASE_CLIENT_PER_THREAD, only for the calling thread)
+        return get_supabase_client()
     
     def setup_database(self) -> None:
-        """Create necessary tables for OSConstruction if they don't exist."""
-        # Create main company table
-        self._create_company_table()
+        """Create necessary tables for OSConstruction if they don't exist.
         
-        # Create related tables for services, projects, and employees
-        self._create_services_table()
-        self._create_projects_table()
-        self._create_employees_table()
+        The DDL lives in the create_schema() database function (see
+        supabase/migrations), so all tables, triggers and indexes are created
+        with one RPC. It is idempotent and needs the service role key.
+        """
+        self.supabase.rpc("create_schema", {}).execute()
         
         print("Database setup completed successfully!")
     
-    def _create_company_table(self) -> None:
-        """Create the company table."""
-        sql = """
-        CREATE TABLE IF NOT EXISTS os_construction (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-            company_name VARCHAR(255) NOT NULL,
-            company_address TEXT NOT NULL,
-            company_email VARCHAR(255) NOT NULL,
-            company_phone VARCHAR(50) NOT NULL,
-            website VARCHAR(255),
-            description TEXT,
-            founded_year INT,
-            is_verified BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-        );
-        """
-        self.supabase.table("os_construction").execute(sql)
-    
-    def _create_services_table(self) -> None:
-        """Create the services table."""
-        sql = """
-        CREATE TABLE IF NOT EXISTS os_construction_services (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-            company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
-            service_name VARCHAR(255) NOT NULL,
-            description TEXT,
-            is_free BOOLEAN DEFAULT TRUE,
-            eligibility_criteria TEXT,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-        );
-        """
-        self.supabase.table("os_construction_services").execute(sql)
-    
-    def _create_projects_table(self) -> None:
-        """Create the projects table."""
-        sql = """
-        CREATE TABLE IF NOT EXISTS os_construction_projects (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-            company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
-            project_name VARCHAR(255) NOT NULL,
-            location TEXT NOT NULL,
-            start_date DATE,
-            end_date DATE,
-            status VARCHAR(50) DEFAULT 'planned',
-            description TEXT,
-            beneficiary_info TEXT,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-        );
-        """
-        self.supabase.table("os_construction_projects").execute(sql)
-    
-    def _create_employees_table(self) -> None:
-        """Create the employees table."""
-        sql = """
-        CREATE TABLE IF NOT EXISTS os_construction_employees (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-            company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
-            full_name VARCHAR(255) NOT NULL,
-            position VARCHAR(100) NOT NULL,
-            email VARCHAR(255),
-            phone VARCHAR(50),
-            specialization VARCHAR(100),
-            join_date DATE,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-        );
-        """
-        self.supabase.table("os_construction_employees").execute(sql)
-    
     # Company management methods
-    def add_company(self, company_data: Dict[str, Any]) -> Dict:
+    def add_company(self, company_data: dict[str, Any]) -> dict:
         """Add a new construction company."""
         response = self.supabase.table("os_construction").insert(company_data).execute()
-        return response.data[0] if response.data else {}
+        data = response.data
+        return data[0] if data else {}
     
-    def update_company(self, company_id: str, company_data: Dict[str, Any]) -> Dict:
+    def update_company(self, company_id: str, company_data: dict[str, Any]) -> dict:
         """Update an existing construction company."""
-        company_data["updated_at"] = datetime.now().isoformat()
         response = self.supabase.table("os_construction").update(company_data).eq("id", company_id).execute()
-        return response.data[0] if response.data else {}
+        data = response.data
+        return data[0] if data else {}
     
-    def get_company(self, company_id: str) -> Dict:
-        """Get a company by ID."""
-        response = self.supabase.table("os_construction").select("*").eq("id", company_id).execute()
-        return response.data[0] if response.data else {}
+    def get_company(self, company_id: str, as_model: type[BaseModel] | None = None) -> dict | BaseModel | None:
+        """Get a company by ID, optionally as an instance of as_model."""
+        # maybe_single() asks PostgREST for a bare object; no match gives None
+        response = self.supabase.table("os_construction").select("*").eq("id", company_id).maybe_single().execute()
+        if as_model is not None:
+            return _row_to_response(as_model, response.data) if response else None
+        return response.data if response else {}
     
-    def get_all_companies(self) -> List[Dict]:
-        """Get all construction companies."""
+    def get_company_full(self, company_id: str, as_model: type[BaseModel] | None = None) -> dict | BaseModel | None:
+        """Get a company with its services, projects and employees in one request.
+        
+        PostgREST embeds the child rows through their company_id foreign keys,
+        so this costs one round-trip instead of one per table. Pass
+        CompanyFullResponse as as_model for a typed result.
+        """
+        response = (
+            self.supabase.table("os_construction")
+            .select("*, os_construction_services(*), os_construction_projects(*), os_construction_employees(*)")
+            .eq("id", company_id)
+            .maybe_single()
+            .execute()
+        )
+        if response is None:
+            return None if as_model is not None else {}
+        if as_model is not None:
+            # Embedded rows are nested, so they go through the model's validator
+            return as_model.model_validate(response.data)
+        return response.data
+    
+    def get_all_companies(self, as_model: type[BaseModel] | None = None) -> list[dict | BaseModel]:
+        """Get all construction companies, optionally as instances of as_model."""
         response = self.supabase.table("os_construction").select("*").execute()
-        return response.data if response.data else []
+        return self._rows(response.data, as_model)
     
     def delete_company(self, company_id: str) -> bool:
         """Delete a company by ID."""
         response = self.supabase.table("os_construction").delete().eq("id", company_id).execute()
         return bool(response.data)
     
+    def _insert_bulk(self, table: str, rows: list[dict[str, Any]]) -> list[dict]:
+        """Insert rows with one request per BULK_INSERT_CHUNK_SIZE rows.
+        
+        PostgREST takes a JSON array in a single insert, so N rows cost one
+        round-trip instead of N. Every row should carry the same keys.
+        """
+        inserted = []
+        rows_iter = iter(rows)
+        while chunk := list(islice(rows_iter, BULK_INSERT_CHUNK_SIZE)):
+            response = self.supabase.table(table).insert(chunk).execute()
+            inserted.extend(response.data or [])
+        return inserted
+    
+    def bulk_upsert(self, table: str, rows: list[dict[str, Any]], on_conflict: str = "id") -> list[dict]:
+        """Insert or update rows in batches of BULK_UPSERT_CHUNK_SIZE.
+        
+        Rows whose on_conflict columns match an existing row are merged into
+        it (Prefer: resolution=merge-duplicates), so re-running a seed or
+        import updates instead of failing. Every row should carry the same keys.
+        """
+        upserted = []
+        rows_iter = iter(rows)
+        while chunk := list(islice(rows_iter, BULK_UPSERT_CHUNK_SIZE)):
+            response = self.supabase.table(table).upsert(chunk, on_conflict=on_conflict).execute()
+            upserted.extend(response.data or [])
+        return upserted
+    
     # Service management methods
-    def add_service(self, service_data: Dict[str, Any]) -> Dict:
+    def add_service(self, service_data: dict[str, Any]) -> dict:
         """Add a new service."""
         response = self.supabase.table("os_construction_services").insert(service_data).execute()
-        return response.data[0] if response.data else {}
+        data = response.data
+        return data[0] if data else {}
     
-    def get_company_services(self, company_id: str) -> List[Dict]:
-        """Get all services for a specific company."""
+    def add_services_bulk(self, rows: list[dict[str, Any]]) -> list[dict]:
+        """Add several services in as few requests as possible."""
+        return self._insert_bulk("os_construction_services", rows)
+    
+    def get_company_services(self, company_id: str, as_model: type[BaseModel] | None = None) -> list[dict | BaseModel]:
+        """Get all services for a specific company, optionally as instances of as_model."""
         response = self.supabase.table("os_construction_services").select("*").eq("company_id", company_id).execute()
-        return response.data if response.data else []
+        return self._rows(response.data, as_model)
     
     # Project management methods
-    def add_project(self, project_data: Dict[str, Any]) -> Dict:
+    def add_project(self, project_data: dict[str, Any]) -> dict:
         """Add a new project."""
         response = self.supabase.table("os_construction_projects").insert(project_data).execute()
-        return response.data[0] if response.data else {}
+        data = response.data
+        return data[0] if data else {}
+    
+    def add_projects_bulk(self, rows: list[dict[str, Any]]) -> list[dict]:
+        """Add several projects in as few requests as possible."""
+        return self._insert_bulk("os_construction_projects", rows)
     
-    def get_company_projects(self, company_id: str, status: Optional[str] = None) -> List[Dict]:
+    def get_company_projects(self, company_id: str, status: str | None = None,
+                             as_model: type[BaseModel] | None = None) -> list[dict | BaseModel]:
         """Get all projects for a specific company, optionally filtered by status."""
         query = self.supabase.table("os_construction_projects").select("*").eq("company_id", company_id)
         
@@ -153,18 +201,57 @@ class OSConstructionManager:
             query = query.eq("status", status)
             
         response = query.execute()
-        return response.data if response.data else []
+        return self._rows(response.data, as_model)
+    
+    def get_company_bundle(self, company_id: str, project_status: str | None = None) -> dict[str, list[dict]]:
+        """Get a company's services, projects and employees concurrently.
+        
+        The three reads are issued at once, so the call takes about one
+        round-trip instead of three. Prefer get_company_full when the company
+        row itself is also needed; this suits callers that filter the
+        projects by status.
+        """
+        services = _fanout_executor.submit(self.get_company_services, company_id)
+        projects = _fanout_executor.submit(self.get_company_projects, company_id, project_status)
+        employees = _fanout_executor.submit(self.get_company_employees, company_id)
+        return {
+            "services": services.result(),
+            "projects": projects.result(),
+            "employees": employees.result()
+        }
     
     # Employee management methods
-    def add_employee(self, employee_data: Dict[str, Any]) -> Dict:
+    def add_employee(self, employee_data: dict[str, Any]) -> dict:
         """Add a new employee."""
         response = self.supabase.table("os_construction_employees").insert(employee_data).execute()
-        return response.data[0] if response.data else {}
+        data = response.data
+        return data[0] if data else {}
+    
+    def add_employees_bulk(self, rows: list[dict[str, Any]]) -> list[dict]:
+        """Add several employees in as few requests as possible."""
+        return self._insert_bulk("os_construction_employees", rows)
     
-    def get_company_employees(self, company_id: str) -> List[Dict]:
-        """Get all employees for a specific company."""
+    def get_company_employees(self, company_id: str, as_model: type[BaseModel] | None = None) -> list[dict | BaseModel]:
+        """Get all employees for a specific company, optionally as instances of as_model."""
         response = self.supabase.table("os_construction_employees").select("*").eq("company_id", company_id).execute()
-        return response.data if response.data else []
+        return self._rows(response.data, as_model)
+    
+    @staticmethod
+    def _rows(data: list[dict] | None, as_model: type | None) -> list[Any]:
+        """Return query rows as dicts, or as as_model instances when given.
+        
+        as_model may be a Pydantic response model or one of the msgspec
+        structs in models_fast, the faster choice for large listings.
+        """
+        if not data:
+            return []
+        if as_model is None:
+            return data
+        if issubclass(as_model, msgspec.Struct):
+            return rows_to_structs(as_model, data)
+        if not TRUSTED_DB_READS:
+            return list_adapter(as_model).validate_python(data)
+        return [_row_to_response(as_model, row) for row in data]
 
 # Example usage
 if __name__ == "__main__":
@@ -206,8 +293,7 @@ if __name__ == "__main__":
             }
         ]
         
-        for service_data in services:
-            service = manager.add_service(service_data)
+        for service in manager.add_services_bulk(services):
             print(f"Added service: {service['service_name']}")
         
         # Add a project
@@ -226,18 +312,16 @@ if __name__ == "__main__":
         
         # Get company with all related data
         print("\nCompany Information:")
-        retrieved_company = manager.get_company(company["id"])
+        retrieved_company = manager.get_company_full(company["id"])
         print(f"Name: {retrieved_company['company_name']}")
         print(f"Contact: {retrieved_company['company_email']}")
         
         print("\nServices Offered:")
-        company_services = manager.get_company_services(company["id"])
-        for service in company_services:
+        for service in retrieved_company["os_construction_services"]:
             print(f"- {service['service_name']}: {service['description']}")
         
         print("\nProjects:")
-        company_projects = manager.get_company_projects(company["id"])
-        for project in company_projects:
+        for project in retrieved_company["os_construction_projects"]:
             print(f"- {project['project_name']} ({project['status']}): {project['description']}")
         
     except Exception as e:
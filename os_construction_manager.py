@@ -1,17 +1,165 @@
-import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Union
-from datetime import datetime
 import logging
+from cachetools import TTLCache
+from postgrest.exceptions import APIError
 
 # Import custom modules
 from supabase_client import get_supabase_client
-from exceptions import (ResourceNotFoundError, ValidationError, 
-                       DatabaseConnectionError, DatabaseError)
+from pagination import KEYSET_ORDER, decode_cursor, fetch_offset_page, keyset_paginate, split_page
+from exceptions import ResourceNotFoundError, ValidationError, DatabaseError
 from models import (CompanyCreate, CompanyUpdate, ServiceCreate, 
-                   ProjectCreate, EmployeeCreate)
+                   ProjectCreate, EmployeeCreate,
+                   CompanyResponse, ServiceResponse, ProjectResponse, EmployeeResponse,
+                   PROJECT_STATUSES, VALID_PROJECT_STATUSES, list_adapter)
 
 logger = logging.getLogger(__name__)
 
+# Postgres SQLSTATE raised when company_id does not reference an existing company
+FOREIGN_KEY_VIOLATION = "23503"
+
+# PostgREST error code for an RPC to a function that doesn't exist (migration not applied)
+FUNCTION_NOT_FOUND = "PGRST202"
+
+# Company rows served by get_company, and IDs confirmed by _company_exists,
+# for up to a minute. Company rows change rarely; this manager drops an entry
+# when it updates or deletes the company, and the TTL bounds how stale
+# another process's changes can look. TTLCache isn't thread-safe, hence the lock.
+company_cache = TTLCache(maxsize=1024, ttl=60)
+existing_companies = TTLCache(maxsize=10_000, ttl=60)
+company_cache_lock = threading.Lock()
+
+def forget_company(company_id: str) -> None:
+    """Drop a company from the in-process caches."""
+    with company_cache_lock:
+        company_cache.pop(company_id, None)
+        existing_companies.pop(company_id, None)
+
+def remember_companies(rows: List[Dict[str, Any]]) -> None:
+    """Mark just-inserted companies as existing, so their first child listings skip the probe."""
+    with company_cache_lock:
+        for row in rows:
+            if "id" in row:
+                existing_companies[row["id"]] = True
+
+# Runs the child inserts of the seeding fallback side by side. Long-lived, so
+# with SUPABASE_CLIENT_PER_THREAD its threads keep their clients between calls.
+seed_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="osc-seed")
+
+# Words of a name search; everything else (tsquery operators included) is dropped
+SEARCH_WORD_RE = re.compile(r"\w+")
+
+def prefix_tsquery(text: str) -> str:
+    """Turn free text into a tsquery matching every word as a prefix.
+    
+    "green build" becomes "green:* & build:*". Returns "" when the text
+    has no words.
+    """
+    return " & ".join(f"{word}:*" for word in SEARCH_WORD_RE.findall(text.lower()))
+
+def to_db_data(model, data: Any, exclude_none: bool = False) -> Dict[str, Any]:
+    """Validate data against model unless it already is one, and dump it for the database.
+    
+    A model instance was validated when it was built, so it is only dumped;
+    mode="json" turns dates and URLs into strings ready to send. Raw JSON
+    (e.g. an HTTP request body) is parsed and validated by pydantic-core in
+    one pass, without building an intermediate dict.
+    """
+    if isinstance(data, (bytes, str)):
+        data = model.model_validate_json(data)
+    elif not isinstance(data, model):
+        data = model.model_validate(data)
+    return data.model_dump(mode="json", exclude_none=exclude_none)
+
+def to_db_rows(model, items: Union[List[Any], bytes, str]) -> List[Dict[str, Any]]:
+    """Bulk counterpart of to_db_data: validate and dump a list of records.
+    
+    The cached list validator handles the whole list in one pydantic-core
+    call each way instead of one per record; model instances in the list
+    are kept as they are (revalidate_instances='never'). items may also be
+    a raw JSON array.
+    """
+    adapter = list_adapter(model)
+    if isinstance(items, (bytes, str)):
+        return adapter.dump_python(adapter.validate_json(items), mode="json")
+    return adapter.dump_python(adapter.validate_python(items), mode="json")
+
+def select_columns(columns: Optional[List[str]], model, cursor: Optional[str] = None) -> List[str]:
+    """Return the columns for a listing select, checked against a response model.
+    
+    Callers that only need a few columns skip transferring the rest (large
+    TEXT columns such as description in particular). None selects every column.
+    Cursor pages also get created_at and id, which the next cursor is built from.
+    
+    Raises:
+        ValidationError: If a column isn't a field of the model
+    """
+    if not columns:
+        return ["*"]
+    
+    unknown = [column for column in columns if column not in model.model_fields]
+    if unknown:
+        raise ValidationError(f"Invalid columns: {', '.join(unknown)}")
+    
+    selected = list(dict.fromkeys(columns))
+    if cursor is not None:
+        selected += [key for key in ("created_at", "id") if key not in selected]
+    return selected
+
+def listing_count(cursor: Optional[str], count: str = "exact") -> Optional[str]:
+    """Count mode for a listing select: a total for offset pages only.
+    
+    Counting every matching row would undo the point of a cursor page.
+    """
+    return count if cursor is None else None
+
+def page_result(data: List[Dict], page: int, per_page: int, total_count: int) -> Dict:
+    """Build the paginated response for an offset page."""
+    return {
+        "data": data,
+        "pagination": {
+            "page": page,
+            "per_page": per_page,
+            "total": total_count,
+            "pages": (total_count + per_page - 1) // per_page if total_count > 0 else 0
+        }
+    }
+
+def paginate(query, page: int, per_page: int, cursor: Optional[str] = None) -> Dict:
+    """Execute a listing query for one page, newest rows first.
+    
+    With a cursor (empty for the first page) the page is read by keyset
+    after the cursor's (created_at, id), so deep pages cost the same as the
+    first, and next_cursor is returned instead of totals. Without one,
+    page/per_page offsets are used and the total comes back with the page;
+    a page past the last one is empty.
+    
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    if cursor is None:
+        # One order param: postgrest-py's order() adds a separate one per call
+        query.params = query.params.add("order", KEYSET_ORDER)
+        rows, total_count = fetch_offset_page(query, page, per_page)
+        return page_result(rows, page, per_page, total_count)
+    
+    try:
+        after = decode_cursor(cursor)
+    except ValueError:
+        raise ValidationError("Invalid cursor")
+    
+    response = keyset_paginate(query, after, per_page).execute()
+    rows, next_cursor = split_page(response.data, per_page)
+    return {
+        "data": rows,
+        "pagination": {
+            "per_page": per_page,
+            "next_cursor": next_cursor
+        }
+    }
+
 class OSConstructionManager:
     """Manager class for OSConstruction database operations.
     
@@ -20,104 +168,110 @@ class OSConstructionManager:
     and employees.
     """
     
-    def __init__(self):
-        """Initialize the OSConstructionManager."""
-        self.supabase = get_supabase_client()
+    @property
+    def supabase(self):
+        """The process-wide Supabase client, created on first use.
+        
+        Managers hold no client of their own, so building one per request
+        costs nothing and every manager shares one connection pool.
+        """
+        return get_supabase_client()
+    
+    def _insert_company_child(self, table: str, company_id: Union[str, List[str]], db_data: Any,
+                              columns: Optional[List[str]] = None):
+        """Insert a row (or a list of rows) that belongs to a company.
+        
+        The company_id foreign key does the existence check, so a missing
+        company costs no extra round-trip. The inserted rows come back in the
+        same response (INSERT ... RETURNING), limited to columns when given.
+        """
+        try:
+            insert = self.supabase.table(table).insert(db_data)
+            if columns and columns != ["*"]:
+                # postgrest-py's insert() has no select(); PostgREST reads it from the query string
+                insert.params = insert.params.add("select", ",".join(columns))
+            return insert.execute()
+        except APIError as e:
+            if e.code == FOREIGN_KEY_VIOLATION:
+                if isinstance(company_id, str):
+                    forget_company(company_id)
+                    raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+                for cid in company_id:
+                    forget_company(cid)
+                raise ResourceNotFoundError(f"One of the companies {', '.join(company_id)} was not found")
+            raise
+    
+    def _prepare_child_rows(self, model, items: Union[List[Any], bytes],
+                            company_id: Union[str, List[str]]) -> List[Dict[str, Any]]:
+        """Validate child records and stamp them with company_id.
+        
+        Given a list of IDs, every record is added once per company; each
+        record is still validated only once. Every row gets the same keys,
+        as a multi-row insert requires.
+        """
+        company_ids = [company_id] if isinstance(company_id, str) else company_id
+        validated = to_db_rows(model, items)
+        return [{**db_data, "company_id": cid} for cid in company_ids for db_data in validated]
+    
+    def _company_exists(self, company_id: str) -> bool:
+        """Check whether a company with the given ID exists.
+        
+        Positive answers are cached; a missing company is always re-checked.
+        """
+        with company_cache_lock:
+            if company_id in existing_companies or company_id in company_cache:
+                return True
+        
+        check = self.supabase.table("os_construction").select("id").eq("id", company_id).execute()
+        if not check.data:
+            return False
+        
+        remember_companies(check.data)
+        return True
+    
+    def _company_page(self, function: str, company_id: str, page: int, per_page: int, **params) -> Dict:
+        """Fetch an offset page of a company's rows through a list_company_* function.
+        
+        One request returns the page, its total and whether the company
+        exists (see supabase/migrations).
+        
+        Raises:
+            ResourceNotFoundError: If the company is not found
+        """
+        response = self.supabase.rpc(function, {
+            "cid": company_id,
+            "p_page": page,
+            "p_per_page": per_page,
+            **params
+        }).execute()
+        row = response.data[0]
+        
+        if not row["company_exists"]:
+            raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+        
+        return page_result(row["data"], page, per_page, row["total"])
     
     def setup_database(self) -> None:
-        """Create necessary tables for OSConstruction if they don't exist."""
+        """Create necessary tables for OSConstruction if they don't exist.
+        
+        All tables, triggers and indexes are created by the create_schema()
+        database function (see supabase/migrations) in one RPC, and so in one
+        transaction. It is idempotent and needs the service role key.
+        """
         try:
-            # Create main company table
-            self._create_company_table()
-            
-            # Create related tables for services, projects, and employees
-            self._create_services_table()
-            self._create_projects_table()
-            self._create_employees_table()
+            self.supabase.rpc("create_schema", {}).execute()
             
             logger.info("Database setup completed successfully!")
         except Exception as e:
             logger.error(f"Error setting up database: {e}")
             raise DatabaseError(f"Failed to set up database: {str(e)}")
     
-    def _create_company_table(self) -> None:
-        """Create the company table."""
-        sql = """
-        CREATE TABLE IF NOT EXISTS os_construction (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-            company_name VARCHAR(255) NOT NULL,
-            company_address TEXT NOT NULL,
-            company_email VARCHAR(255) NOT NULL,
-            company_phone VARCHAR(50) NOT NULL,
-            website VARCHAR(255),
-            description TEXT,
-            founded_year INT,
-            is_verified BOOLEAN DEFAULT FALSE,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-        );
-        """
-        self.supabase.table("os_construction").execute(sql)
-    
-    def _create_services_table(self) -> None:
-        """Create the services table."""
-        sql = """
-        CREATE TABLE IF NOT EXISTS os_construction_services (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-            company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
-            service_name VARCHAR(255) NOT NULL,
-            description TEXT,
-            is_free BOOLEAN DEFAULT TRUE,
-            eligibility_criteria TEXT,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-        );
-        """
-        self.supabase.table("os_construction_services").execute(sql)
-    
-    def _create_projects_table(self) -> None:
-        """Create the projects table."""
-        sql = """
-        CREATE TABLE IF NOT EXISTS os_construction_projects (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-            company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
-            project_name VARCHAR(255) NOT NULL,
-            location TEXT NOT NULL,
-            start_date DATE,
-            end_date DATE,
-            status VARCHAR(50) DEFAULT 'planned',
-            description TEXT,
-            beneficiary_info TEXT,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-        );
-        """
-        self.supabase.table("os_construction_projects").execute(sql)
-    
-    def _create_employees_table(self) -> None:
-        """Create the employees table."""
-        sql = """
-        CREATE TABLE IF NOT EXISTS os_construction_employees (
-            id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-            company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
-            full_name VARCHAR(255) NOT NULL,
-            position VARCHAR(100) NOT NULL,
-            email VARCHAR(255),
-            phone VARCHAR(50),
-            specialization VARCHAR(100),
-            join_date DATE,
-            created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
-            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
-        );
-        """
-        self.supabase.table("os_construction_employees").execute(sql)
-    
     # Company management methods
-    def add_company(self, company_data: Union[Dict[str, Any], CompanyCreate]) -> Dict:
+    def add_company(self, company_data: Union[Dict[str, Any], bytes, CompanyCreate]) -> Dict:
         """Add a new construction company.
         
         Args:
-            company_data: Company data as a dict or CompanyCreate instance
+            company_data: Company data as a dict, raw JSON or a CompanyCreate instance
             
         Returns:
             Dict: The created company record
@@ -127,24 +281,18 @@ class OSConstructionManager:
             DatabaseError: If the database operation fails
         """
         try:
-            # Handle both dict and Pydantic model inputs
-            if isinstance(company_data, CompanyCreate):
-                db_data = company_data.dict()
-            else:
-                # Validate with Pydantic model
-                validated_data = CompanyCreate(**company_data)
-                db_data = validated_data.dict()
-            
-            # Add timestamps
-            now = datetime.now().isoformat()
-            db_data["created_at"] = now
-            db_data["updated_at"] = now
+            # Dicts are validated; CompanyCreate instances already were. None values
+            # are left out, so the payload is smaller and column defaults apply.
+            db_data = to_db_data(CompanyCreate, company_data, exclude_none=True)
             
+            # created_at/updated_at come from the column defaults and the
+            # set_updated_at trigger, so they follow the database clock
             response = self.supabase.table("os_construction").insert(db_data).execute()
             
             if not response.data:
                 raise DatabaseError("Failed to create company")
-                
+            
+            remember_companies(response.data)
             return response.data[0]
         except Exception as e:
             logger.error(f"Error adding company: {e}")
@@ -152,12 +300,152 @@ class OSConstructionManager:
                 raise
             raise DatabaseError(f"Failed to add company: {str(e)}")
     
-    def update_company(self, company_id: str, company_data: Union[Dict[str, Any], CompanyUpdate]) -> Dict:
+    def add_companies_bulk(self, companies_data: Union[List[Union[Dict[str, Any], CompanyCreate]], bytes],
+                           columns: Optional[List[str]] = None) -> List[Dict]:
+        """Add several construction companies in a single insert.
+        
+        Args:
+            companies_data: Company records as dicts or CompanyCreate instances, or
+                a raw JSON array
+            columns: Columns to return for each created row (default: all);
+                e.g. ["id"] is enough to attach child records afterwards
+            
+        Returns:
+            List[Dict]: The created company records, in input order
+            
+        Raises:
+            ValidationError: If the data is invalid
+            DatabaseError: If the database operation fails
+        """
+        try:
+            if not companies_data:
+                return []
+            
+            db_rows = to_db_rows(CompanyCreate, companies_data)
+            
+            # PostgREST takes the whole array as one multi-row INSERT
+            insert = self.supabase.table("os_construction").insert(db_rows)
+            columns = select_columns(columns, CompanyResponse)
+            if columns and columns != ["*"]:
+                insert.params = insert.params.add("select", ",".join(columns))
+            response = insert.execute()
+            
+            if not response.data:
+                raise DatabaseError("Failed to create companies")
+            
+            remember_companies(response.data)
+            return response.data
+        except Exception as e:
+            logger.error(f"Error adding companies: {e}")
+            if isinstance(e, (ValidationError, DatabaseError)):
+                raise
+            raise DatabaseError(f"Failed to add companies: {str(e)}")
+    
+    def seed_companies(self, companies_data: List[Union[Dict[str, Any], CompanyCreate]],
+                       services_data: List[Union[Dict[str, Any], ServiceCreate]] = (),
+                       projects_data: List[Union[Dict[str, Any], ProjectCreate]] = (),
+                       employees_data: List[Union[Dict[str, Any], EmployeeCreate]] = ()) -> List[str]:
+        """Add companies that each get the same services, projects and employees.
+        
+        The records are validated here and inserted by the seed_companies()
+        database function (see supabase/migrations) in one request and one
+        transaction, so a failure leaves nothing behind. Without that
+        function it falls back to one bulk insert per table. Needs the
+        service role key.
+        
+        Args:
+            companies_data: Company records as dicts or CompanyCreate instances
+            services_data: Service records added to every company
+            projects_data: Project records added to every company
+            employees_data: Employee records added to every company
+            
+        Returns:
+            List[str]: The IDs of the created companies
+            
+        Raises:
+            ValidationError: If the data is invalid
+            DatabaseError: If the database operation fails
+        """
+        try:
+            if not companies_data:
+                return []
+            
+            rows = {
+                "companies": to_db_rows(CompanyCreate, companies_data),
+                "services": to_db_rows(ServiceCreate, services_data),
+                "projects": to_db_rows(ProjectCreate, projects_data),
+                "employees": to_db_rows(EmployeeCreate, employees_data)
+            }
+            
+            try:
+                response = self.supabase.rpc("seed_companies", rows).execute()
+            except APIError as e:
+                if e.code != FUNCTION_NOT_FOUND:
+                    raise
+                logger.warning("seed_companies() is missing; seeding with one insert per table")
+                return self._seed_companies_bulk(rows)
+            
+            remember_companies(response.data)
+            return [row["id"] for row in response.data]
+        except Exception as e:
+            logger.error(f"Error seeding companies: {e}")
+            if isinstance(e, (ValidationError, DatabaseError)):
+                raise
+            raise DatabaseError(f"Failed to seed companies: {str(e)}")
+    
+    def _seed_companies_bulk(self, rows: Dict[str, List[Dict[str, Any]]]) -> List[str]:
+        """seed_companies without the database function: one insert per table.
+        
+        The three child inserts only depend on the company IDs, so they are
+        sent side by side on the shared connection pool.
+        """
+        company_ids = [company["id"] for company in self.add_companies_bulk(rows["companies"], columns=["id"])]
+        inserts = [
+            seed_executor.submit(self.add_services_bulk, rows["services"], company_ids, columns=["id"]),
+            seed_executor.submit(self.add_projects_bulk, rows["projects"], company_ids, columns=["id"]),
+            seed_executor.submit(self.add_employees_bulk, rows["employees"], company_ids, columns=["id"])
+        ]
+        for insert in inserts:
+            insert.result()
+        return company_ids
+    
+    def add_company_raw(self, db_data: Dict[str, Any]) -> Dict:
+        """Insert a company row as given, without validation.
+        
+        For trusted internal callers (seeding, imports) whose rows were
+        already validated or come from the database itself; everyone else
+        should use add_company.
+        
+        Args:
+            db_data: JSON-ready os_construction column values
+            
+        Returns:
+            Dict: The created company record
+            
+        Raises:
+            DatabaseError: If the database operation fails
+        """
+        try:
+            response = self.supabase.table("os_construction").insert(db_data).execute()
+            
+            if not response.data:
+                raise DatabaseError("Failed to create company")
+            
+            remember_companies(response.data)
+            return response.data[0]
+        except Exception as e:
+            logger.error(f"Error adding company: {e}")
+            if isinstance(e, DatabaseError):
+                raise
+            raise DatabaseError(f"Failed to add company: {str(e)}")
+    
+    def update_company(self, company_id: str, company_data: Union[Dict[str, Any], bytes, CompanyUpdate]) -> Dict:
         """Update an existing construction company.
         
         Args:
             company_id: The ID of the company to update
-            company_data: The updated company data
+            company_data: The updated company data as a dict, raw JSON or a
+                CompanyUpdate instance
             
         Returns:
             Dict: The updated company record
@@ -168,27 +456,16 @@ class OSConstructionManager:
             DatabaseError: If the database operation fails
         """
         try:
-            # Check if company exists
-            check = self.supabase.table("os_construction").select("id").eq("id", company_id).execute()
-            if not check.data:
-                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-            
-            # Handle both dict and Pydantic model inputs
-            if isinstance(company_data, CompanyUpdate):
-                # Convert to dict and remove None values
-                db_data = {k: v for k, v in company_data.dict().items() if v is not None}
-            else:
-                # Validate with Pydantic model
-                validated_data = CompanyUpdate(**company_data)
-                db_data = {k: v for k, v in validated_data.dict().items() if v is not None}
-            
-            # Add updated timestamp
-            db_data["updated_at"] = datetime.now().isoformat()
+            # Dicts are validated; CompanyUpdate instances already were.
+            # None values are left out so they don't overwrite columns.
+            db_data = to_db_data(CompanyUpdate, company_data, exclude_none=True)
             
+            # An update that matches no rows means the company doesn't exist
             response = self.supabase.table("os_construction").update(db_data).eq("id", company_id).execute()
+            forget_company(company_id)
             
             if not response.data:
-                raise DatabaseError("Failed to update company")
+                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
                 
             return response.data[0]
         except Exception as e:
@@ -211,12 +488,20 @@ class OSConstructionManager:
             DatabaseError: If the database operation fails
         """
         try:
+            with company_cache_lock:
+                company = company_cache.get(company_id)
+            if company is not None:
+                return company
+            
             response = self.supabase.table("os_construction").select("*").eq("id", company_id).execute()
             
             if not response.data:
                 raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-                
-            return response.data[0]
+            
+            company = response.data[0]
+            with company_cache_lock:
+                company_cache[company_id] = company
+            return company
         except Exception as e:
             logger.error(f"Error getting company {company_id}: {e}")
             if isinstance(e, ResourceNotFoundError):
@@ -225,49 +510,328 @@ class OSConstructionManager:
     
     def get_all_companies(self, page: int = 1, per_page: int = 10, 
                          is_verified: Optional[bool] = None, 
-                         name_search: Optional[str] = None) -> Dict:
+                         name_search: Optional[str] = None,
+                         columns: Optional[List[str]] = None,
+                         cursor: Optional[str] = None) -> Dict:
         """Get all construction companies with pagination and filtering.
         
         Args:
             page: Page number (starts at 1)
             per_page: Number of items per page
             is_verified: Filter by verification status
-            name_search: Filter by company name (partial match)
+            name_search: Filter by words in the company name or description
+                (each word matched as a prefix)
+            columns: Columns to return (default: all)
+            cursor: next_cursor from the previous page ("" for the first) to
+                page by keyset instead of page number; deep pages stay fast
             
         Returns:
             Dict: Paginated response with company records
             
         Raises:
+            ValidationError: If a column or the cursor is invalid
+            DatabaseError: If the database operation fails
+        """
+        try:
+            # Build query; offset pages get the filtered total in the
+            # Content-Range header alongside the page. count="estimated" counts
+            # exactly up to PostgREST's max-rows and uses the planner's row
+            # estimate beyond that, so a large table isn't scanned per page.
+            query = self.supabase.table("os_construction").select(
+                *select_columns(columns, CompanyResponse, cursor), count=listing_count(cursor, "estimated"))
+            
+            # Apply filters
+            if is_verified is not None:
+                query = query.eq("is_verified", is_verified)
+                
+            # Full-text match on the search_vec computed field, served by its
+            # GIN expression index (see supabase/migrations)
+            search = prefix_tsquery(name_search) if name_search else ""
+            if search:
+                query = query.filter("search_vec", "fts(simple)", search)
+            
+            # Newest first, the order list_companies uses; the created_at/id
+            # indexes serve it, so pages are stable and need no sort
+            return paginate(query, page, per_page, cursor)
+        except Exception as e:
+            logger.error(f"Error getting all companies: {e}")
+            if isinstance(e, ValidationError):
+                raise
+            raise DatabaseError(f"Failed to retrieve companies: {str(e)}")
+    
+    def delete_company(self, company_id: str) -> bool:
+        """Delete a company by ID.
+        
+        Args:
+            company_id: The ID of the company to delete
+            
+        Returns:
+            bool: True if successful
+            
+        Raises:
+            ResourceNotFoundError: If the company is not found
+            DatabaseError: If the database operation fails
+        """
+        try:
+            # The deleted rows come back, so an empty result means it didn't exist
+            response = self.supabase.table("os_construction").delete().eq("id", company_id).execute()
+            forget_company(company_id)
+            
+            if not response.data:
+                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+                
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting company {company_id}: {e}")
+            if isinstance(e, ResourceNotFoundError):
+                raise
+            raise DatabaseError(f"Failed to delete company: {str(e)}")
+    
+    # Service management methods
+    def add_service(self, service_data: Union[Dict[str, Any], bytes, ServiceCreate], company_id: str) -> Dict:
+        """Add a new service for a company.
+        
+        Args:
+            service_data: Service data as a dict, raw JSON or a ServiceCreate instance
+            company_id: The ID of the company to add the service to
+            
+        Returns:
+            Dict: The created service record
+            
+        Raises:
+            ResourceNotFoundError: If the company is not found
+            ValidationError: If the data is invalid
+            DatabaseError: If the database operation fails
+        """
+        try:
+            # Dicts are validated; ServiceCreate instances already were. None values
+            # are left out, so the payload is smaller and column defaults apply.
+            db_data = to_db_data(ServiceCreate, service_data, exclude_none=True)
+            
+            # Add company ID
+            db_data["company_id"] = company_id
+            
+            response = self._insert_company_child("os_construction_services", company_id, db_data)
+            
+            if not response.data:
+                raise DatabaseError("Failed to create service")
+                
+            return response.data[0]
+        except Exception as e:
+            logger.error(f"Error adding service for company {company_id}: {e}")
+            if isinstance(e, (ResourceNotFoundError, ValidationError, DatabaseError)):
+                raise
+            raise DatabaseError(f"Failed to add service: {str(e)}")
+    
+    def add_services_bulk(self, services_data: Union[List[Union[Dict[str, Any], ServiceCreate]], bytes],
+                          company_id: Union[str, List[str]],
+                          columns: Optional[List[str]] = None) -> List[Dict]:
+        """Add several services for a company in a single insert.
+        
+        Args:
+            services_data: Service records as dicts or ServiceCreate instances, or
+                a raw JSON array
+            company_id: The ID of the company to add the services to, or a
+                list of IDs to add every record to each of those companies
+            columns: Columns to return for each created row (default: all);
+                e.g. ["id"] keeps large TEXT columns out of the response
+            
+        Returns:
+            List[Dict]: The created service records
+            
+        Raises:
+            ResourceNotFoundError: If a company is not found
+            ValidationError: If the data is invalid
+            DatabaseError: If the database operation fails
+        """
+        try:
+            if not services_data or not company_id:
+                return []
+            
+            db_rows = self._prepare_child_rows(ServiceCreate, services_data, company_id)
+            
+            # PostgREST takes the whole array as one multi-row INSERT
+            response = self._insert_company_child("os_construction_services", company_id, db_rows,
+                                                  select_columns(columns, ServiceResponse))
+            
+            if not response.data:
+                raise DatabaseError("Failed to create services")
+                
+            return response.data
+        except Exception as e:
+            logger.error(f"Error adding services for company {company_id}: {e}")
+            if isinstance(e, (ResourceNotFoundError, ValidationError, DatabaseError)):
+                raise
+            raise DatabaseError(f"Failed to add services: {str(e)}")
+    
+    def get_company_services(self, company_id: str, page: int = 1, per_page: int = 10,
+                             columns: Optional[List[str]] = None,
+                             cursor: Optional[str] = None) -> Dict:
+        """Get all services for a specific company with pagination.
+        
+        Args:
+            company_id: The ID of the company
+            page: Page number (starts at 1)
+            per_page: Number of items per page
+            columns: Columns to return (default: all)
+            cursor: next_cursor from the previous page ("" for the first) to
+                page by keyset instead of page number; deep pages stay fast
+            
+        Returns:
+            Dict: Paginated response with service records
+            
+        Raises:
+            ResourceNotFoundError: If the company is not found
+            ValidationError: If a column or the cursor is invalid
             DatabaseError: If the database operation fails
         """
         try:
-            # Calculate offset for pagination
-            offset = (page - 1) * per_page
+            # Offset pages of full rows take one call to a plpgsql function
+            if cursor is None and not columns:
+                return self._company_page("list_company_services", company_id, page, per_page)
+            
+            # Get services with pagination; offset pages bring their total along
+            query = self.supabase.table("os_construction_services").select(
+                *select_columns(columns, ServiceResponse, cursor), count=listing_count(cursor)).eq("company_id", company_id)
+            result = paginate(query, page, per_page, cursor)
+            
+            # Rows prove the company exists; only an empty page needs the check
+            if not result["data"] and not self._company_exists(company_id):
+                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+            
+            return result
+        except Exception as e:
+            logger.error(f"Error getting services for company {company_id}: {e}")
+            if isinstance(e, (ResourceNotFoundError, ValidationError)):
+                raise
+            raise DatabaseError(f"Failed to retrieve services: {str(e)}")
+    
+    # Project management methods
+    def add_project(self, project_data: Union[Dict[str, Any], bytes, ProjectCreate], company_id: str) -> Dict:
+        """Add a new project for a company.
+        
+        Args:
+            project_data: Project data as a dict, raw JSON or a ProjectCreate instance
+            company_id: The ID of the company to add the project to
             
-            # Build query
-            query = self.supabase.table("os_construction_projects").select("*").eq("company_id", company_id)
+        Returns:
+            Dict: The created project record
+            
+        Raises:
+            ResourceNotFoundError: If the company is not found
+            ValidationError: If the data is invalid
+            DatabaseError: If the database operation fails
+        """
+        try:
+            # Dicts are validated; ProjectCreate instances already were. None values
+            # are left out, so the payload is smaller and column defaults apply.
+            db_data = to_db_data(ProjectCreate, project_data, exclude_none=True)
+            
+            # Add company ID
+            db_data["company_id"] = company_id
+            
+            response = self._insert_company_child("os_construction_projects", company_id, db_data)
+            
+            if not response.data:
+                raise DatabaseError("Failed to create project")
+                
+            return response.data[0]
+        except Exception as e:
+            logger.error(f"Error adding project for company {company_id}: {e}")
+            if isinstance(e, (ResourceNotFoundError, ValidationError, DatabaseError)):
+                raise
+            raise DatabaseError(f"Failed to add project: {str(e)}")
+    
+    def add_projects_bulk(self, projects_data: Union[List[Union[Dict[str, Any], ProjectCreate]], bytes],
+                          company_id: Union[str, List[str]],
+                          columns: Optional[List[str]] = None) -> List[Dict]:
+        """Add several projects for a company in a single insert.
+        
+        Args:
+            projects_data: Project records as dicts or ProjectCreate instances, or
+                a raw JSON array
+            company_id: The ID of the company to add the projects to, or a
+                list of IDs to add every record to each of those companies
+            columns: Columns to return for each created row (default: all);
+                e.g. ["id"] keeps large TEXT columns out of the response
+            
+        Returns:
+            List[Dict]: The created project records
+            
+        Raises:
+            ResourceNotFoundError: If a company is not found
+            ValidationError: If the data is invalid
+            DatabaseError: If the database operation fails
+        """
+        try:
+            if not projects_data or not company_id:
+                return []
+            
+            db_rows = self._prepare_child_rows(ProjectCreate, projects_data, company_id)
+            
+            # PostgREST takes the whole array as one multi-row INSERT
+            response = self._insert_company_child("os_construction_projects", company_id, db_rows,
+                                                  select_columns(columns, ProjectResponse))
+            
+            if not response.data:
+                raise DatabaseError("Failed to create projects")
+                
+            return response.data
+        except Exception as e:
+            logger.error(f"Error adding projects for company {company_id}: {e}")
+            if isinstance(e, (ResourceNotFoundError, ValidationError, DatabaseError)):
+                raise
+            raise DatabaseError(f"Failed to add projects: {str(e)}")
+    
+    def get_company_projects(self, company_id: str, status: Optional[str] = None, 
+                           page: int = 1, per_page: int = 10,
+                           columns: Optional[List[str]] = None,
+                           cursor: Optional[str] = None) -> Dict:
+        """Get all projects for a specific company with filtering and pagination.
+        
+        Args:
+            company_id: The ID of the company
+            status: Filter by project status
+            page: Page number (starts at 1)
+            per_page: Number of items per page
+            columns: Columns to return (default: all)
+            cursor: next_cursor from the previous page ("" for the first) to
+                page by keyset instead of page number; deep pages stay fast
+            
+        Returns:
+            Dict: Paginated response with project records
+            
+        Raises:
+            ResourceNotFoundError: If the company is not found
+            ValidationError: If status, a column or the cursor is invalid
+            DatabaseError: If the database operation fails
+        """
+        try:
+            # Validate status if provided
+            if status and status not in VALID_PROJECT_STATUSES:
+                raise ValidationError(f"Invalid status. Must be one of {list(PROJECT_STATUSES)}")
+            
+            # Offset pages of full rows take one call to a plpgsql function;
+            # like the query below, an empty status means no filter
+            if cursor is None and not columns:
+                return self._company_page("list_company_projects", company_id, page, per_page,
+                                          p_status=status or None)
+            
+            # Build query; for offset pages count="exact" returns the filtered
+            # total in the Content-Range header alongside the page
+            query = self.supabase.table("os_construction_projects").select(
+                *select_columns(columns, ProjectResponse, cursor), count=listing_count(cursor)).eq("company_id", company_id)
             
             if status:
                 query = query.eq("status", status)
             
-            # Get total count (filtered)
-            count_response = query.execute()
-            total_count = len(count_response.data)
-            
-            # Apply pagination
-            query = query.range(offset, offset + per_page - 1)
-            response = query.execute()
-            
-            # Return paginated response
-            return {
-                "data": response.data,
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": total_count,
-                    "pages": (total_count + per_page - 1) // per_page if total_count > 0 else 0
-                }
-            }
+            result = paginate(query, page, per_page, cursor)
+            
+            # Rows prove the company exists; only an empty page needs the check
+            if not result["data"] and not self._company_exists(company_id):
+                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
+            
+            return result
         except Exception as e:
             logger.error(f"Error getting projects for company {company_id}: {e}")
             if isinstance(e, (ResourceNotFoundError, ValidationError)):
@@ -275,11 +839,11 @@ class OSConstructionManager:
             raise DatabaseError(f"Failed to retrieve projects: {str(e)}")
     
     # Employee management methods
-    def add_employee(self, employee_data: Union[Dict[str, Any], EmployeeCreate], company_id: str) -> Dict:
+    def add_employee(self, employee_data: Union[Dict[str, Any], bytes, EmployeeCreate], company_id: str) -> Dict:
         """Add a new employee for a company.
         
         Args:
-            employee_data: Employee data
+            employee_data: Employee data as a dict, raw JSON or a EmployeeCreate instance
             company_id: The ID of the company to add the employee to
             
         Returns:
@@ -291,32 +855,14 @@ class OSConstructionManager:
             DatabaseError: If the database operation fails
         """
         try:
-            # Check if company exists
-            check = self.supabase.table("os_construction").select("id").eq("id", company_id).execute()
-            if not check.data:
-                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-            
-            # Handle both dict and Pydantic model inputs
-            if isinstance(employee_data, EmployeeCreate):
-                db_data = employee_data.dict()
-            else:
-                # Validate with Pydantic model
-                validated_data = EmployeeCreate(**employee_data)
-                db_data = validated_data.dict()
+            # Dicts are validated; EmployeeCreate instances already were. None values
+            # are left out, so the payload is smaller and column defaults apply.
+            db_data = to_db_data(EmployeeCreate, employee_data, exclude_none=True)
             
             # Add company ID
             db_data["company_id"] = company_id
             
-            # Handle date field - convert to ISO format string
-            if db_data.get("join_date"):
-                db_data["join_date"] = db_data["join_date"].isoformat()
-            
-            # Add timestamps
-            now = datetime.now().isoformat()
-            db_data["created_at"] = now
-            db_data["updated_at"] = now
-            
-            response = self.supabase.table("os_construction_employees").insert(db_data).execute()
+            response = self._insert_company_child("os_construction_employees", company_id, db_data)
             
             if not response.data:
                 raise DatabaseError("Failed to create employee")
@@ -328,59 +874,96 @@ class OSConstructionManager:
                 raise
             raise DatabaseError(f"Failed to add employee: {str(e)}")
     
-    def get_company_employees(self, company_id: str, page: int = 1, per_page: int = 10) -> Dict:
+    def add_employees_bulk(self, employees_data: Union[List[Union[Dict[str, Any], EmployeeCreate]], bytes],
+                           company_id: Union[str, List[str]],
+                           columns: Optional[List[str]] = None) -> List[Dict]:
+        """Add several employees for a company in a single insert.
+        
+        Args:
+            employees_data: Employee records as dicts or EmployeeCreate instances, or
+                a raw JSON array
+            company_id: The ID of the company to add the employees to, or a
+                list of IDs to add every record to each of those companies
+            columns: Columns to return for each created row (default: all);
+                e.g. ["id"] keeps large TEXT columns out of the response
+            
+        Returns:
+            List[Dict]: The created employee records
+            
+        Raises:
+            ResourceNotFoundError: If a company is not found
+            ValidationError: If the data is invalid
+            DatabaseError: If the database operation fails
+        """
+        try:
+            if not employees_data or not company_id:
+                return []
+            
+            db_rows = self._prepare_child_rows(EmployeeCreate, employees_data, company_id)
+            
+            # PostgREST takes the whole array as one multi-row INSERT
+            response = self._insert_company_child("os_construction_employees", company_id, db_rows,
+                                                  select_columns(columns, EmployeeResponse))
+            
+            if not response.data:
+                raise DatabaseError("Failed to create employees")
+                
+            return response.data
+        except Exception as e:
+            logger.error(f"Error adding employees for company {company_id}: {e}")
+            if isinstance(e, (ResourceNotFoundError, ValidationError, DatabaseError)):
+                raise
+            raise DatabaseError(f"Failed to add employees: {str(e)}")
+    
+    def get_company_employees(self, company_id: str, page: int = 1, per_page: int = 10,
+                              columns: Optional[List[str]] = None,
+                              cursor: Optional[str] = None) -> Dict:
         """Get all employees for a specific company with pagination.
         
         Args:
             company_id: The ID of the company
             page: Page number (starts at 1)
             per_page: Number of items per page
+            columns: Columns to return (default: all)
+            cursor: next_cursor from the previous page ("" for the first) to
+                page by keyset instead of page number; deep pages stay fast
             
         Returns:
             Dict: Paginated response with employee records
             
         Raises:
             ResourceNotFoundError: If the company is not found
+            ValidationError: If a column or the cursor is invalid
             DatabaseError: If the database operation fails
         """
         try:
-            # Check if company exists
-            check = self.supabase.table("os_construction").select("id").eq("id", company_id).execute()
-            if not check.data:
+            # Offset pages of full rows take one call to a plpgsql function
+            if cursor is None and not columns:
+                return self._company_page("list_company_employees", company_id, page, per_page)
+            
+            # Get employees with pagination; offset pages bring their total along
+            query = self.supabase.table("os_construction_employees").select(
+                *select_columns(columns, EmployeeResponse, cursor), count=listing_count(cursor)).eq("company_id", company_id)
+            result = paginate(query, page, per_page, cursor)
+            
+            # Rows prove the company exists; only an empty page needs the check
+            if not result["data"] and not self._company_exists(company_id):
                 raise ResourceNotFoundError(f"Company with ID {company_id} not found")
             
-            # Calculate offset for pagination
-            offset = (page - 1) * per_page
-            
-            # Get total count
-            count_query = self.supabase.table("os_construction_employees").select("count", count="exact").eq("company_id", company_id)
-            count_response = count_query.execute()
-            total_count = count_response.count if hasattr(count_response, 'count') else 0
-            
-            # Get employees with pagination
-            query = self.supabase.table("os_construction_employees").select("*").eq("company_id", company_id)
-            query = query.range(offset, offset + per_page - 1)
-            response = query.execute()
-            
-            # Return paginated response
-            return {
-                "data": response.data,
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": total_count,
-                    "pages": (total_count + per_page - 1) // per_page if total_count > 0 else 0
-                }
-            }
+            return result
         except Exception as e:
             logger.error(f"Error getting employees for company {company_id}: {e}")
-            if isinstance(e, ResourceNotFoundError):
+            if isinstance(e, (ResourceNotFoundError, ValidationError)):
                 raise
             raise DatabaseError(f"Failed to retrieve employees: {str(e)}")
     
     # Advanced methods
     def transfer_employee(self, employee_id: str, from_company_id: str, to_company_id: str) -> bool:
-        """Transfer an employee from one company to another using a transaction.
+        """Transfer an employee from one company to another.
+        
+        The move is a single UPDATE statement, so it is atomic: concurrent
+        transfers of the same employee can't both succeed, and a missing
+        destination company leaves the employee where they were.
         
         Args:
             employee_id: The ID of the employee to transfer
@@ -395,35 +978,29 @@ class OSConstructionManager:
             DatabaseError: If the database operation fails
         """
         try:
-            # Check if employee exists in the first company
-            employee_check = self.supabase.table("os_construction_employees").select("*").eq("id", employee_id).eq("company_id", from_company_id).execute()
-            
-            if not employee_check.data:
-                raise ResourceNotFoundError(f"Employee with ID {employee_id} not found in company {from_company_id}")
-            
-            # Check if destination company exists
-            company_check = self.supabase.table("os_construction").select("id").eq("id", to_company_id).execute()
-            
-            if not company_check.data:
-                raise ResourceNotFoundError(f"Destination company with ID {to_company_id} not found")
-            
-            # Get employee data
-            employee_data = employee_check.data[0]
-            
-            # Create transaction function
-            # Note: This is a simplified version since Supabase doesn't directly support transactions through the API
-            # In a real application, you would create a PostgreSQL function for this
-            
-            # Update employee record
+            # One conditional UPDATE: it only matches the employee while they
+            # still belong to from_company_id, and the company_id foreign key
+            # rejects a destination company that doesn't exist
             update_data = {
-                "company_id": to_company_id,
-                "updated_at": datetime.now().isoformat()
+                "company_id": to_company_id
             }
             
-            response = self.supabase.table("os_construction_employees").update(update_data).eq("id", employee_id).execute()
+            try:
+                response = (
+                    self.supabase.table("os_construction_employees")
+                    .update(update_data)
+                    .eq("id", employee_id)
+                    .eq("company_id", from_company_id)
+                    .execute()
+                )
+            except APIError as e:
+                if e.code == FOREIGN_KEY_VIOLATION:
+                    forget_company(to_company_id)
+                    raise ResourceNotFoundError(f"Destination company with ID {to_company_id} not found")
+                raise
             
             if not response.data:
-                raise DatabaseError("Failed to transfer employee")
+                raise ResourceNotFoundError(f"Employee with ID {employee_id} not found in company {from_company_id}")
                 
             return True
         except Exception as e:
@@ -446,38 +1023,14 @@ class OSConstructionManager:
             DatabaseError: If the database operation fails
         """
         try:
-            # Check if company exists and get company data
-            company = self.get_company(company_id)
-            
-            # Get counts
-            services_count = len(self.supabase.table("os_construction_services").select("id").eq("company_id", company_id).execute().data)
-            
-            projects_query = self.supabase.table("os_construction_projects").select("id", "status").eq("company_id", company_id).execute()
-            projects = projects_query.data
-            projects_count = len(projects)
-            
-            # Count projects by status
-            project_status_counts = {}
-            for project in projects:
-                status = project.get("status", "unknown")
-                project_status_counts[status] = project_status_counts.get(status, 0) + 1
-            
-            employees_count = len(self.supabase.table("os_construction_employees").select("id").eq("company_id", company_id).execute().data)
-            
-            # Construct summary
-            summary = {
-                "company": company,
-                "counts": {
-                    "services": services_count,
-                    "projects": {
-                        "total": projects_count,
-                        "by_status": project_status_counts
-                    },
-                    "employees": employees_count
-                }
-            }
+            # One RPC (see supabase/migrations) returns the company with its
+            # counts aggregated in Postgres; no row means no such company
+            response = self.supabase.rpc("get_company_summary", {"cid": company_id}).execute()
+            
+            if not response.data:
+                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
             
-            return summary
+            return response.data[0]["summary"]
         except Exception as e:
             logger.error(f"Error getting summary for company {company_id}: {e}")
             if isinstance(e, ResourceNotFoundError):
@@ -532,8 +1085,7 @@ if __name__ == "__main__":
             }
         ]
         
-        for service_data in services:
-            service = manager.add_service(service_data, company["id"])
+        for service in manager.add_services_bulk(services, company["id"]):
             logger.info(f"Added service: {service['service_name']}")
         
         # Add a project
@@ -554,255 +1106,4 @@ if __name__ == "__main__":
         logger.info(f"Company Summary: {summary}")
         
     except Exception as e:
-        logger.error(f"Error in example: {e}")
-
-            # Build query
-            query = self.supabase.table("os_construction").select("*")
-            
-            # Apply filters
-            if is_verified is not None:
-                query = query.eq("is_verified", is_verified)
-                
-            if name_search:
-                query = query.ilike("company_name", f"%{name_search}%")
-            
-            # Get total count
-            count_query = query
-            count_response = count_query.execute()
-            total_count = len(count_response.data)
-            
-            # Apply pagination
-            query = query.range(offset, offset + per_page - 1)
-            response = query.execute()
-            
-            # Return paginated response
-            return {
-                "data": response.data,
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": total_count,
-                    "pages": (total_count + per_page - 1) // per_page if total_count > 0 else 0
-                }
-            }
-        except Exception as e:
-            logger.error(f"Error getting all companies: {e}")
-            raise DatabaseError(f"Failed to retrieve companies: {str(e)}")
-    
-    def delete_company(self, company_id: str) -> bool:
-        """Delete a company by ID.
-        
-        Args:
-            company_id: The ID of the company to delete
-            
-        Returns:
-            bool: True if successful
-            
-        Raises:
-            ResourceNotFoundError: If the company is not found
-            DatabaseError: If the database operation fails
-        """
-        try:
-            # Check if company exists
-            check = self.supabase.table("os_construction").select("id").eq("id", company_id).execute()
-            if not check.data:
-                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-            
-            response = self.supabase.table("os_construction").delete().eq("id", company_id).execute()
-            
-            if not response.data:
-                raise DatabaseError("Failed to delete company")
-                
-            return True
-        except Exception as e:
-            logger.error(f"Error deleting company {company_id}: {e}")
-            if isinstance(e, ResourceNotFoundError):
-                raise
-            raise DatabaseError(f"Failed to delete company: {str(e)}")
-    
-    # Service management methods
-    def add_service(self, service_data: Union[Dict[str, Any], ServiceCreate], company_id: str) -> Dict:
-        """Add a new service for a company.
-        
-        Args:
-            service_data: Service data
-            company_id: The ID of the company to add the service to
-            
-        Returns:
-            Dict: The created service record
-            
-        Raises:
-            ResourceNotFoundError: If the company is not found
-            ValidationError: If the data is invalid
-            DatabaseError: If the database operation fails
-        """
-        try:
-            # Check if company exists
-            check = self.supabase.table("os_construction").select("id").eq("id", company_id).execute()
-            if not check.data:
-                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-            
-            # Handle both dict and Pydantic model inputs
-            if isinstance(service_data, ServiceCreate):
-                db_data = service_data.dict()
-            else:
-                # Validate with Pydantic model
-                validated_data = ServiceCreate(**service_data)
-                db_data = validated_data.dict()
-            
-            # Add company ID and timestamps
-            db_data["company_id"] = company_id
-            now = datetime.now().isoformat()
-            db_data["created_at"] = now
-            db_data["updated_at"] = now
-            
-            response = self.supabase.table("os_construction_services").insert(db_data).execute()
-            
-            if not response.data:
-                raise DatabaseError("Failed to create service")
-                
-            return response.data[0]
-        except Exception as e:
-            logger.error(f"Error adding service for company {company_id}: {e}")
-            if isinstance(e, (ResourceNotFoundError, ValidationError, DatabaseError)):
-                raise
-            raise DatabaseError(f"Failed to add service: {str(e)}")
-    
-    def get_company_services(self, company_id: str, page: int = 1, per_page: int = 10) -> Dict:
-        """Get all services for a specific company with pagination.
-        
-        Args:
-            company_id: The ID of the company
-            page: Page number (starts at 1)
-            per_page: Number of items per page
-            
-        Returns:
-            Dict: Paginated response with service records
-            
-        Raises:
-            ResourceNotFoundError: If the company is not found
-            DatabaseError: If the database operation fails
-        """
-        try:
-            # Check if company exists
-            check = self.supabase.table("os_construction").select("id").eq("id", company_id).execute()
-            if not check.data:
-                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-            
-            # Calculate offset for pagination
-            offset = (page - 1) * per_page
-            
-            # Get total count
-            count_query = self.supabase.table("os_construction_services").select("count", count="exact").eq("company_id", company_id)
-            count_response = count_query.execute()
-            total_count = count_response.count if hasattr(count_response, 'count') else 0
-            
-            # Get services with pagination
-            query = self.supabase.table("os_construction_services").select("*").eq("company_id", company_id)
-            query = query.range(offset, offset + per_page - 1)
-            response = query.execute()
-            
-            # Return paginated response
-            return {
-                "data": response.data,
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": total_count,
-                    "pages": (total_count + per_page - 1) // per_page if total_count > 0 else 0
-                }
-            }
-        except Exception as e:
-            logger.error(f"Error getting services for company {company_id}: {e}")
-            if isinstance(e, ResourceNotFoundError):
-                raise
-            raise DatabaseError(f"Failed to retrieve services: {str(e)}")
-    
-    # Project management methods
-    def add_project(self, project_data: Union[Dict[str, Any], ProjectCreate], company_id: str) -> Dict:
-        """Add a new project for a company.
-        
-        Args:
-            project_data: Project data
-            company_id: The ID of the company to add the project to
-            
-        Returns:
-            Dict: The created project record
-            
-        Raises:
-            ResourceNotFoundError: If the company is not found
-            ValidationError: If the data is invalid
-            DatabaseError: If the database operation fails
-        """
-        try:
-            # Check if company exists
-            check = self.supabase.table("os_construction").select("id").eq("id", company_id).execute()
-            if not check.data:
-                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-            
-            # Handle both dict and Pydantic model inputs
-            if isinstance(project_data, ProjectCreate):
-                db_data = project_data.dict()
-            else:
-                # Validate with Pydantic model
-                validated_data = ProjectCreate(**project_data)
-                db_data = validated_data.dict()
-            
-            # Add company ID
-            db_data["company_id"] = company_id
-            
-            # Handle date fields - convert to ISO format strings
-            if db_data.get("start_date"):
-                db_data["start_date"] = db_data["start_date"].isoformat()
-            if db_data.get("end_date"):
-                db_data["end_date"] = db_data["end_date"].isoformat()
-            
-            # Add timestamps
-            now = datetime.now().isoformat()
-            db_data["created_at"] = now
-            db_data["updated_at"] = now
-            
-            response = self.supabase.table("os_construction_projects").insert(db_data).execute()
-            
-            if not response.data:
-                raise DatabaseError("Failed to create project")
-                
-            return response.data[0]
-        except Exception as e:
-            logger.error(f"Error adding project for company {company_id}: {e}")
-            if isinstance(e, (ResourceNotFoundError, ValidationError, DatabaseError)):
-                raise
-            raise DatabaseError(f"Failed to add project: {str(e)}")
-    
-    def get_company_projects(self, company_id: str, status: Optional[str] = None, 
-                           page: int = 1, per_page: int = 10) -> Dict:
-        """Get all projects for a specific company with filtering and pagination.
-        
-        Args:
-            company_id: The ID of the company
-            status: Filter by project status
-            page: Page number (starts at 1)
-            per_page: Number of items per page
-            
-        Returns:
-            Dict: Paginated response with project records
-            
-        Raises:
-            ResourceNotFoundError: If the company is not found
-            ValidationError: If status is invalid
-            DatabaseError: If the database operation fails
-        """
-        try:
-            # Check if company exists
-            check = self.supabase.table("os_construction").select("id").eq("id", company_id).execute()
-            if not check.data:
-                raise ResourceNotFoundError(f"Company with ID {company_id} not found")
-            
-            # Validate status if provided
-            if status:
-                valid_statuses = ['planned', 'in_progress', 'completed', 'cancelled', 'on_hold']
-                if status not in valid_statuses:
-                    raise ValidationError(f"Invalid status. Must be one of {valid_statuses}")
-            
-            # Calculate offset for pagination
-            offset = (page - 1) * per_page
\ No newline at end of file
+        logger.error(f"Error in example: {e}")
\ No newline at end of file
@@ -0,0 +1,123 @@
+import json
+import uuid
+import base64
+import datetime
+from postgrest.exceptions import APIError
+
+# PostgREST error code (HTTP 416) for an offset past the last matching row
+RANGE_NOT_SATISFIABLE = "PGRST103"
+
+# Keyset order shared by every cursor-paginated list: newest first, id as tiebreaker
+KEYSET_ORDER = "created_at.desc,id.desc"
+
+
+def encode_cursor(row):
+    """Build the opaque cursor that resumes a listing after the given row.
+
+    Args:
+        row (dict): The last row of the current page
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = json.dumps([row["created_at"], row["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor (str): Cursor from the request; empty means the first page
+
+    Returns:
+        tuple: (created_at, id) of the row to resume after, or None
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        # Both values end up inside a PostgREST filter, so only accept well-formed ones
+        datetime.datetime.fromisoformat(created_at)
+        uuid.UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    return created_at, row_id
+
+
+def fetch_offset_page(query, page, per_page):
+    """Execute one offset page of a select query and return its rows and total.
+
+    The total is the query's count (0 without one). PostgREST answers a page
+    past the last row with 416 instead of an empty list, and the error
+    carries no Content-Range, so that case is re-read as the first row alone
+    to get the total.
+
+    Args:
+        query: The filtered, ordered select query
+        page (int): 1-based page number
+        per_page (int): Rows per page
+
+    Returns:
+        tuple: (rows, total)
+    """
+    offset = (page - 1) * per_page
+    try:
+        # postgrest-py's range() end is exclusive
+        response = query.range(offset, offset + per_page).execute()
+    except APIError as e:
+        if e.code != RANGE_NOT_SATISFIABLE:
+            raise
+        response = query.range(0, 1).execute()
+        return [], response.count or 0
+    return response.data, response.count or 0
+
+
+def keyset_paginate(query, after, per_page):
+    """Apply keyset pagination to a Supabase select query.
+
+    Rows are read in KEYSET_ORDER starting strictly after the (created_at, id)
+    pair, so Postgres walks the index from that point instead of skipping
+    OFFSET rows. One extra row is requested to tell whether a next page exists.
+
+    Args:
+        query: The filtered select query
+        after (tuple): (created_at, id) from decode_cursor, or None
+        per_page (int): Rows per page
+
+    Returns:
+        The query with ordering, the keyset filter and the limit applied
+    """
+    # postgrest-py has no or_() and appends a separate order param per order()
+    # call, so both are set as raw PostgREST parameters
+    query.params = query.params.add("order", KEYSET_ORDER)
+
+    if after:
+        created_at, row_id = after
+        query.params = query.params.add(
+            "or",
+            f'(created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id}))'
+        )
+
+    return query.limit(per_page + 1)
+
+
+def split_page(rows, per_page):
+    """Trim the look-ahead row from a keyset page.
+
+    Args:
+        rows (list): Rows returned by a keyset_paginate query
+        per_page (int): Rows per page
+
+    Returns:
+        tuple: (rows for this page, cursor for the next page or None)
+    """
+    if len(rows) > per_page:
+        return rows[:per_page], encode_cursor(rows[per_page - 1])
+    return rows, None
\ No newline at end of file
@@ -0,0 +1,51 @@
+import random
+import time
+import httpx
+
+from supabase_client import get_supabase_client, reset_supabase_client
+
+# Failures raised before the request reached PostgREST - always safe to resend
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Failures after the request was sent - only safe to resend for idempotent calls
+READ_ERRORS = (httpx.ReadError, httpx.ReadTimeout, httpx.RemoteProtocolError)
+
+
+def retry_db(fn, *, max_retries=3, base=0.1, cap=2.0, idempotent=True):
+    """Run a PostgREST call, retrying transient transport failures.
+
+    Sleeps with full jitter (a random delay up to base * 2**attempt, capped)
+    between attempts so that workers hitting a saturated pool back off at
+    different times instead of retrying in lockstep.
+
+    Args:
+        fn: Zero-argument callable that builds and executes the query. It must
+            fetch the client itself so a retry picks up a rebuilt client.
+        max_retries: Number of retries after the first attempt
+        base: Initial backoff in seconds
+        cap: Maximum backoff in seconds
+        idempotent: Whether the call may be resent after a read failure. Pass
+            False for inserts, which could otherwise be applied twice.
+
+    Returns:
+        Whatever fn returns
+
+    Raises:
+        httpx.HTTPError: If the last attempt still fails
+    """
+    retryable = CONNECT_ERRORS + READ_ERRORS if idempotent else CONNECT_ERRORS
+
+    for attempt in range(max_retries + 1):
+        client = get_supabase_client()
+        try:
+            return fn()
+        except retryable as e:
+            if attempt == max_retries:
+                raise
+            
+            # An exhausted pool may be holding dead connections - start a fresh
+            # one, unless a concurrent failure already has
+            if isinstance(e, httpx.PoolTimeout):
+                reset_supabase_client(stale=client)
+            
+            time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
\ No newline at end of file
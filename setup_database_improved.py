@@ -1,6 +1,9 @@
 import os
+import queue
+import atexit
 import logging
 import argparse
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 
 # Import custom modules
@@ -8,18 +11,39 @@ from supabase_client import get_supabase_client
 from os_construction_manager import OSConstructionManager
 from exceptions import DatabaseError
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('setup_database.log')
-    ]
-)
-
 logger = logging.getLogger(__name__)
 
+# Background thread writing the setup log, started by setup_logging()
+log_listener = None
+
+def setup_logging():
+    """Log to the console and setup_database.log without blocking the caller.
+    
+    Configures the root logger, so only the script entry point calls it;
+    importing this module or calling setup_database() from other code
+    leaves the caller's logging alone. Handlers only enqueue records; a
+    background QueueListener thread does the writes.
+    """
+    global log_listener
+    if log_listener is not None:
+        return
+    
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.StreamHandler(), logging.FileHandler('setup_database.log')]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue = queue.SimpleQueue()
+    log_listener = QueueListener(log_queue, *handlers)
+    log_listener.start()
+    
+    # Flush whatever is still queued on shutdown
+    atexit.register(log_listener.stop)
+    
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+
 def setup_database(sample_data=False):
     """Set up the OSConstruction database.
     
@@ -52,6 +76,127 @@ def setup_database(sample_data=False):
         logger.error(f"Error setting up database: {e}")
         return False
 
+# Sample data for create_sample_data: every company gets the same services,
+# projects and employees. Built once at import rather than on every call.
+SAMPLE_COMPANIES = (
+    {
+        "company_name": "OSConstruction Free Services",
+        "company_address": "456 Builder Boulevard, Community City, CC 54321",
+        "company_email": "contact@osconstructionfree.example.org",
+        "company_phone": "+1-555-789-0123",
+        "website": "https://osconstructionfree.example.org",
+        "description": "Providing free construction services to underserved communities",
+        "founded_year": 2020,
+        "is_verified": True
+    },
+    {
+        "company_name": "Community Builders Alliance",
+        "company_address": "789 Helper Street, Volunteer Valley, VV 98765",
+        "company_email": "info@communitybuilders.example.org",
+        "company_phone": "+1-555-456-7890",
+        "website": "https://communitybuilders.example.org",
+        "description": "A network of volunteer builders helping low-income families",
+        "founded_year": 2018,
+        "is_verified": True
+    },
+    {
+        "company_name": "Rebuild Together",
+        "company_address": "321 Unity Road, Collaboration City, CC 45678",
+        "company_email": "hello@rebuildtogether.example.org",
+        "company_phone": "+1-555-234-5678",
+        "website": "https://rebuildtogether.example.org",
+        "description": "Collaborative construction efforts for disaster recovery",
+        "founded_year": 2019,
+        "is_verified": False
+    }
+)
+
+SAMPLE_SERVICES = (
+    {
+        "service_name": "Home Repairs",
+        "description": "Basic home repairs for elderly and disabled individuals",
+        "is_free": True,
+        "eligibility_criteria": "Must be 65+ or have a disability, income below poverty line"
+    },
+    {
+        "service_name": "Disaster Recovery",
+        "description": "Rebuilding assistance after natural disasters",
+        "is_free": True,
+        "eligibility_criteria": "Must be affected by a declared natural disaster"
+    },
+    {
+        "service_name": "Community Facilities",
+        "description": "Building and renovating community centers, parks, and public spaces",
+        "is_free": True,
+        "eligibility_criteria": "Must be a registered non-profit or community organization"
+    }
+)
+
+SAMPLE_PROJECTS = (
+    {
+        "project_name": "Community Center Renovation",
+        "location": "Downtown Community City",
+        "start_date": "2025-04-15",
+        "end_date": "2025-06-30",
+        "status": "planned",
+        "description": "Renovating the community center to provide better facilities",
+        "beneficiary_info": "Local community organizations and residents"
+    },
+    {
+        "project_name": "Senior Housing Repairs",
+        "location": "Elderly Estates, Volunteer Valley",
+        "start_date": "2025-03-01",
+        "end_date": "2025-05-15",
+        "status": "in_progress",
+        "description": "Repairing and upgrading housing for senior citizens",
+        "beneficiary_info": "Senior residents of Elderly Estates"
+    },
+    {
+        "project_name": "Playground Installation",
+        "location": "Family Park, Collaboration City",
+        "start_date": "2025-05-10",
+        "end_date": "2025-05-25",
+        "status": "planned",
+        "description": "Installing new playground equipment for children",
+        "beneficiary_info": "Local families and children"
+    }
+)
+
+SAMPLE_EMPLOYEES = (
+    {
+        "full_name": "John Builder",
+        "position": "Construction Manager",
+        "email": "john@example.org",
+        "phone": "+1-555-111-2222",
+        "specialization": "Project Management",
+        "join_date": "2020-01-15"
+    },
+    {
+        "full_name": "Sarah Carpenter",
+        "position": "Lead Carpenter",
+        "email": "sarah@example.org",
+        "phone": "+1-555-333-4444",
+        "specialization": "Woodworking",
+        "join_date": "2020-02-01"
+    },
+    {
+        "full_name": "Michael Electrician",
+        "position": "Senior Electrician",
+        "email": "michael@example.org",
+        "phone": "+1-555-555-6666",
+        "specialization": "Electrical Systems",
+        "join_date": "2020-03-10"
+    },
+    {
+        "full_name": "Jessica Plumber",
+        "position": "Plumbing Expert",
+        "email": "jessica@example.org",
+        "phone": "+1-555-777-8888",
+        "specialization": "Plumbing",
+        "join_date": "2020-04-05"
+    }
+)
+
 def create_sample_data(manager):
     """Create sample data in the database.
     
@@ -59,146 +204,11 @@ def create_sample_data(manager):
         manager: OSConstructionManager instance
     """
     try:
-        # Add sample companies
-        companies = [
-            {
-                "company_name": "OSConstruction Free Services",
-                "company_address": "456 Builder Boulevard, Community City, CC 54321",
-                "company_email": "contact@osconstructionfree.example.org",
-                "company_phone": "+1-555-789-0123",
-                "website": "https://osconstructionfree.example.org",
-                "description": "Providing free construction services to underserved communities",
-                "founded_year": 2020,
-                "is_verified": True
-            },
-            {
-                "company_name": "Community Builders Alliance",
-                "company_address": "789 Helper Street, Volunteer Valley, VV 98765",
-                "company_email": "info@communitybuilders.example.org",
-                "company_phone": "+1-555-456-7890",
-                "website": "https://communitybuilders.example.org",
-                "description": "A network of volunteer builders helping low-income families",
-                "founded_year": 2018,
-                "is_verified": True
-            },
-            {
-                "company_name": "Rebuild Together",
-                "company_address": "321 Unity Road, Collaboration City, CC 45678",
-                "company_email": "hello@rebuildtogether.example.org",
-                "company_phone": "+1-555-234-5678",
-                "website": "https://rebuildtogether.example.org",
-                "description": "Collaborative construction efforts for disaster recovery",
-                "founded_year": 2019,
-                "is_verified": False
-            }
-        ]
-        
-        company_ids = []
-        for company_data in companies:
-            company = manager.add_company(company_data)
-            company_ids.append(company["id"])
-            logger.info(f"Added company: {company['company_name']} with ID: {company['id']}")
-            
-            # Add services for each company
-            services = [
-                {
-                    "service_name": "Home Repairs",
-                    "description": "Basic home repairs for elderly and disabled individuals",
-                    "is_free": True,
-                    "eligibility_criteria": "Must be 65+ or have a disability, income below poverty line"
-                },
-                {
-                    "service_name": "Disaster Recovery",
-                    "description": "Rebuilding assistance after natural disasters",
-                    "is_free": True,
-                    "eligibility_criteria": "Must be affected by a declared natural disaster"
-                },
-                {
-                    "service_name": "Community Facilities",
-                    "description": "Building and renovating community centers, parks, and public spaces",
-                    "is_free": True,
-                    "eligibility_criteria": "Must be a registered non-profit or community organization"
-                }
-            ]
-            
-            for service_data in services:
-                service = manager.add_service(service_data, company["id"])
-                logger.info(f"Added service: {service['service_name']} to company: {company['company_name']}")
-            
-            # Add projects for each company
-            projects = [
-                {
-                    "project_name": "Community Center Renovation",
-                    "location": "Downtown Community City",
-                    "start_date": "2025-04-15",
-                    "end_date": "2025-06-30",
-                    "status": "planned",
-                    "description": "Renovating the community center to provide better facilities",
-                    "beneficiary_info": "Local community organizations and residents"
-                },
-                {
-                    "project_name": "Senior Housing Repairs",
-                    "location": "Elderly Estates, Volunteer Valley",
-                    "start_date": "2025-03-01",
-                    "end_date": "2025-05-15",
-                    "status": "in_progress",
-                    "description": "Repairing and upgrading housing for senior citizens",
-                    "beneficiary_info": "Senior residents of Elderly Estates"
-                },
-                {
-                    "project_name": "Playground Installation",
-                    "location": "Family Park, Collaboration City",
-                    "start_date": "2025-05-10",
-                    "end_date": "2025-05-25",
-                    "status": "planned",
-                    "description": "Installing new playground equipment for children",
-                    "beneficiary_info": "Local families and children"
-                }
-            ]
-            
-            for project_data in projects:
-                project = manager.add_project(project_data, company["id"])
-                logger.info(f"Added project: {project['project_name']} to company: {company['company_name']}")
-            
-            # Add employees for each company
-            employees = [
-                {
-                    "full_name": "John Builder",
-                    "position": "Construction Manager",
-                    "email": "john@example.org",
-                    "phone": "+1-555-111-2222",
-                    "specialization": "Project Management",
-                    "join_date": "2020-01-15"
-                },
-                {
-                    "full_name": "Sarah Carpenter",
-                    "position": "Lead Carpenter",
-                    "email": "sarah@example.org",
-                    "phone": "+1-555-333-4444",
-                    "specialization": "Woodworking",
-                    "join_date": "2020-02-01"
-                },
-                {
-                    "full_name": "Michael Electrician",
-                    "position": "Senior Electrician",
-                    "email": "michael@example.org",
-                    "phone": "+1-555-555-6666",
-                    "specialization": "Electrical Systems",
-                    "join_date": "2020-03-10"
-                },
-                {
-                    "full_name": "Jessica Plumber",
-                    "position": "Plumbing Expert",
-                    "email": "jessica@example.org",
-                    "phone": "+1-555-777-8888",
-                    "specialization": "Plumbing",
-                    "join_date": "2020-04-05"
-                }
-            ]
-            
-            for employee_data in employees:
-                employee = manager.add_employee(employee_data, company["id"])
-                logger.info(f"Added employee: {employee['full_name']} to company: {company['company_name']}")
+        # The companies and every child record go in with one request and
+        # one transaction (the seed_companies() database function)
+        company_ids = manager.seed_companies(SAMPLE_COMPANIES, SAMPLE_SERVICES, SAMPLE_PROJECTS, SAMPLE_EMPLOYEES)
+        logger.info(f"Added {len(company_ids)} companies, each with {len(SAMPLE_SERVICES)} services, "
+                    f"{len(SAMPLE_PROJECTS)} projects and {len(SAMPLE_EMPLOYEES)} employees")
         
         return company_ids
             
@@ -211,6 +221,7 @@ if __name__ == "__main__":
     parser.add_argument('--sample', action='store_true', help='Create sample data')
     
     args = parser.parse_args()
+    setup_logging()
     
     if setup_database(args.sample):
         print("Database setup completed successfully!")
@@ -0,0 +1,59 @@
+-- The four OSConstruction tables, so `supabase db push` can build the schema
+-- on an empty database: every later migration indexes, alters or adds
+-- triggers to these tables. IF NOT EXISTS leaves databases that were set up
+-- through setup_database() / create_schema() untouched. The project status
+-- CHECK is added by 20261015000400_project_status_check.
+
+CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+
+CREATE TABLE IF NOT EXISTS os_construction (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    company_name VARCHAR(255) NOT NULL,
+    company_address TEXT NOT NULL,
+    company_email VARCHAR(255) NOT NULL,
+    company_phone VARCHAR(50) NOT NULL,
+    website VARCHAR(255),
+    description TEXT,
+    founded_year INT,
+    is_verified BOOLEAN DEFAULT FALSE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS os_construction_services (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
+    service_name VARCHAR(255) NOT NULL,
+    description TEXT,
+    is_free BOOLEAN DEFAULT TRUE,
+    eligibility_criteria TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS os_construction_projects (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
+    project_name VARCHAR(255) NOT NULL,
+    location TEXT NOT NULL,
+    start_date DATE,
+    end_date DATE,
+    status VARCHAR(50) DEFAULT 'planned',
+    description TEXT,
+    beneficiary_info TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS os_construction_employees (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
+    full_name VARCHAR(255) NOT NULL,
+    position VARCHAR(100) NOT NULL,
+    email VARCHAR(255),
+    phone VARCHAR(50),
+    specialization VARCHAR(100),
+    join_date DATE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
\ No newline at end of file
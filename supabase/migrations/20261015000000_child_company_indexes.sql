@@ -0,0 +1,18 @@
+-- Index the company_id foreign key on every child table.
+-- The nested /api/companies/<id>/... endpoints and the embedded selects look
+-- children up by company_id; without these indexes each lookup (and every
+-- ON DELETE CASCADE from os_construction) is a sequential scan.
+--
+-- Plain CREATE INDEX is used because migrations run inside a transaction,
+-- where CONCURRENTLY is not allowed. On a large live table, run the
+-- CONCURRENTLY form by hand first; IF NOT EXISTS then makes this a no-op.
+
+CREATE INDEX IF NOT EXISTS idx_services_company_id
+    ON os_construction_services (company_id);
+
+-- Covers the ?status= filter on the projects endpoint as well
+CREATE INDEX IF NOT EXISTS idx_projects_company_id_status
+    ON os_construction_projects (company_id, status);
+
+CREATE INDEX IF NOT EXISTS idx_employees_company_id
+    ON os_construction_employees (company_id);
\ No newline at end of file
@@ -0,0 +1,9 @@
+-- Trigram index for the ?name= search on GET /api/companies.
+-- The API filters with company_name ILIKE '%term%'; a leading wildcard can't
+-- use a B-tree, so without this every search is a sequential scan. A pg_trgm
+-- GIN index serves ILIKE substring matches directly, so the query is unchanged.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_os_construction_company_name_trgm
+    ON os_construction USING gin (company_name gin_trgm_ops);
\ No newline at end of file
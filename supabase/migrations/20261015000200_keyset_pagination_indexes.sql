@@ -0,0 +1,16 @@
+-- Indexes matching the keyset order (created_at DESC, id DESC) used by the
+-- cursor-paginated list endpoints. Each page is then an index range read of
+-- per_page rows, however deep the cursor is. The child tables lead with
+-- company_id because their listings are always scoped to one company.
+
+CREATE INDEX IF NOT EXISTS idx_os_construction_created_at_id
+    ON os_construction (created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_services_company_id_created_at_id
+    ON os_construction_services (company_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_projects_company_id_created_at_id
+    ON os_construction_projects (company_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_employees_company_id_created_at_id
+    ON os_construction_employees (company_id, created_at DESC, id DESC);
\ No newline at end of file
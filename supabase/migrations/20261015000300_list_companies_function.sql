@@ -0,0 +1,35 @@
+-- One-statement page + total for GET /api/companies (offset pagination).
+-- Returns one row (data JSONB array of the page, total matching rows) so the
+-- API gets the page and its count from a single planned query instead of a
+-- select plus a separate count. A table result (not a bare JSONB value) keeps
+-- the response a JSON array, which postgrest-py requires. Filters mirror the
+-- endpoint's ?name= (substring, served by the trigram index) and ?is_verified=;
+-- NULL means "don't filter".
+
+CREATE OR REPLACE FUNCTION list_companies(
+    p_page INT,
+    p_per_page INT,
+    p_name TEXT DEFAULT NULL,
+    p_is_verified BOOLEAN DEFAULT NULL
+)
+RETURNS TABLE (data JSONB, total BIGINT)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH filtered AS (
+        SELECT *
+        FROM os_construction
+        WHERE (p_name IS NULL OR company_name ILIKE '%' || p_name || '%')
+          AND (p_is_verified IS NULL OR is_verified = p_is_verified)
+    ),
+    page AS (
+        SELECT *
+        FROM filtered
+        ORDER BY created_at DESC, id DESC
+        OFFSET (p_page - 1) * p_per_page
+        LIMIT p_per_page
+    )
+    SELECT
+        COALESCE((SELECT jsonb_agg(page ORDER BY created_at DESC, id DESC) FROM page), '[]'::jsonb),
+        (SELECT count(*) FROM filtered);
+$$;
\ No newline at end of file
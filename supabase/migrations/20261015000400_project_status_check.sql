@@ -0,0 +1,11 @@
+-- Enforce the project statuses the API accepts (models.ProjectStatus) in the
+-- database as well. Added NOT VALID so existing rows are not scanned under the
+-- lock; run VALIDATE CONSTRAINT once any legacy values have been cleaned up.
+
+ALTER TABLE os_construction_projects
+    DROP CONSTRAINT IF EXISTS os_construction_projects_status_check;
+
+ALTER TABLE os_construction_projects
+    ADD CONSTRAINT os_construction_projects_status_check
+    CHECK (status IN ('planned', 'in_progress', 'completed', 'cancelled', 'on_hold'))
+    NOT VALID;
\ No newline at end of file
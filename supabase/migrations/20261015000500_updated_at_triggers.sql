@@ -0,0 +1,26 @@
+-- Keep updated_at current in the database instead of sending a timestamp
+-- from Python with every UPDATE. Rows get NOW() from the column default on
+-- insert and from this trigger on every update, whichever client wrote them.
+
+CREATE OR REPLACE FUNCTION trigger_set_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS set_updated_at ON os_construction;
+CREATE TRIGGER set_updated_at BEFORE UPDATE ON os_construction
+    FOR EACH ROW EXECUTE FUNCTION trigger_set_updated_at();
+
+DROP TRIGGER IF EXISTS set_updated_at ON os_construction_services;
+CREATE TRIGGER set_updated_at BEFORE UPDATE ON os_construction_services
+    FOR EACH ROW EXECUTE FUNCTION trigger_set_updated_at();
+
+DROP TRIGGER IF EXISTS set_updated_at ON os_construction_projects;
+CREATE TRIGGER set_updated_at BEFORE UPDATE ON os_construction_projects
+    FOR EACH ROW EXECUTE FUNCTION trigger_set_updated_at();
+
+DROP TRIGGER IF EXISTS set_updated_at ON os_construction_employees;
+CREATE TRIGGER set_updated_at BEFORE UPDATE ON os_construction_employees
+    FOR EACH ROW EXECUTE FUNCTION trigger_set_updated_at();
\ No newline at end of file
@@ -0,0 +1,114 @@
+-- The whole schema as one function, so setup_database creates every table,
+-- trigger and index with a single RPC instead of a round-trip per table.
+-- Every statement is idempotent, so calling it again is safe. Returns the
+-- table names (a row set, which postgrest-py requires of RPC results).
+-- Only the service role may run it.
+
+CREATE OR REPLACE FUNCTION create_schema()
+RETURNS SETOF TEXT
+LANGUAGE plpgsql
+AS $schema$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+    CREATE OR REPLACE FUNCTION trigger_set_updated_at() RETURNS TRIGGER AS $trigger$
+    BEGIN
+        NEW.updated_at = NOW();
+        RETURN NEW;
+    END;
+    $trigger$ LANGUAGE plpgsql;
+
+    CREATE TABLE IF NOT EXISTS os_construction (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        company_name VARCHAR(255) NOT NULL,
+        company_address TEXT NOT NULL,
+        company_email VARCHAR(255) NOT NULL,
+        company_phone VARCHAR(50) NOT NULL,
+        website VARCHAR(255),
+        description TEXT,
+        founded_year INT,
+        is_verified BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    CREATE TABLE IF NOT EXISTS os_construction_services (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
+        service_name VARCHAR(255) NOT NULL,
+        description TEXT,
+        is_free BOOLEAN DEFAULT TRUE,
+        eligibility_criteria TEXT,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    CREATE TABLE IF NOT EXISTS os_construction_projects (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
+        project_name VARCHAR(255) NOT NULL,
+        location TEXT NOT NULL,
+        start_date DATE,
+        end_date DATE,
+        status VARCHAR(50) DEFAULT 'planned'
+            CHECK (status IN ('planned', 'in_progress', 'completed', 'cancelled', 'on_hold')),
+        description TEXT,
+        beneficiary_info TEXT,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    CREATE TABLE IF NOT EXISTS os_construction_employees (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        company_id UUID REFERENCES os_construction(id) ON DELETE CASCADE,
+        full_name VARCHAR(255) NOT NULL,
+        position VARCHAR(100) NOT NULL,
+        email VARCHAR(255),
+        phone VARCHAR(50),
+        specialization VARCHAR(100),
+        join_date DATE,
+        created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+        updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+    );
+
+    DROP TRIGGER IF EXISTS set_updated_at ON os_construction;
+    CREATE TRIGGER set_updated_at BEFORE UPDATE ON os_construction
+        FOR EACH ROW EXECUTE FUNCTION trigger_set_updated_at();
+
+    DROP TRIGGER IF EXISTS set_updated_at ON os_construction_services;
+    CREATE TRIGGER set_updated_at BEFORE UPDATE ON os_construction_services
+        FOR EACH ROW EXECUTE FUNCTION trigger_set_updated_at();
+
+    DROP TRIGGER IF EXISTS set_updated_at ON os_construction_projects;
+    CREATE TRIGGER set_updated_at BEFORE UPDATE ON os_construction_projects
+        FOR EACH ROW EXECUTE FUNCTION trigger_set_updated_at();
+
+    DROP TRIGGER IF EXISTS set_updated_at ON os_construction_employees;
+    CREATE TRIGGER set_updated_at BEFORE UPDATE ON os_construction_employees
+        FOR EACH ROW EXECUTE FUNCTION trigger_set_updated_at();
+
+    -- Same indexes as the earlier migrations
+    CREATE INDEX IF NOT EXISTS idx_services_company_id
+        ON os_construction_services (company_id);
+    CREATE INDEX IF NOT EXISTS idx_projects_company_id_status
+        ON os_construction_projects (company_id, status);
+    CREATE INDEX IF NOT EXISTS idx_employees_company_id
+        ON os_construction_employees (company_id);
+    CREATE INDEX IF NOT EXISTS idx_os_construction_company_name_trgm
+        ON os_construction USING gin (company_name gin_trgm_ops);
+    CREATE INDEX IF NOT EXISTS idx_os_construction_created_at_id
+        ON os_construction (created_at DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_services_company_id_created_at_id
+        ON os_construction_services (company_id, created_at DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_projects_company_id_created_at_id
+        ON os_construction_projects (company_id, created_at DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_employees_company_id_created_at_id
+        ON os_construction_employees (company_id, created_at DESC, id DESC);
+
+    RETURN QUERY SELECT unnest(ARRAY['os_construction', 'os_construction_services', 'os_construction_projects', 'os_construction_employees']);
+END;
+$schema$;
+
+REVOKE EXECUTE ON FUNCTION create_schema() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION create_schema() TO service_role;
\ No newline at end of file
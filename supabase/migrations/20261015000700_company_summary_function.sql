@@ -0,0 +1,35 @@
+-- Company row plus its child counts for OSConstructionManager.get_company_summary,
+-- in one round-trip. The counts and the per-status tally are aggregated here
+-- instead of pulling every project row back to count in Python. The result
+-- has the same shape the method returned before ({company, counts}); it is
+-- wrapped in a one-row table because postgrest-py requires a JSON array, and
+-- no row comes back when the company does not exist.
+
+CREATE OR REPLACE FUNCTION get_company_summary(cid UUID)
+RETURNS TABLE (summary JSONB)
+LANGUAGE sql
+STABLE
+AS $$
+    SELECT jsonb_build_object(
+        'company', to_jsonb(c),
+        'counts', jsonb_build_object(
+            'services', (SELECT count(*) FROM os_construction_services WHERE company_id = cid),
+            'projects', jsonb_build_object(
+                'total', (SELECT count(*) FROM os_construction_projects WHERE company_id = cid),
+                'by_status', COALESCE(
+                    (SELECT jsonb_object_agg(COALESCE(s.status, 'unknown'), s.n)
+                     FROM (
+                         SELECT status, count(*) AS n
+                         FROM os_construction_projects
+                         WHERE company_id = cid
+                         GROUP BY status
+                     ) s),
+                    '{}'::jsonb
+                )
+            ),
+            'employees', (SELECT count(*) FROM os_construction_employees WHERE company_id = cid)
+        )
+    )
+    FROM os_construction c
+    WHERE c.id = cid;
+$$;
\ No newline at end of file
@@ -0,0 +1,9 @@
+-- Serves the ?is_verified= filter of the company listing (list_companies and
+-- OSConstructionManager.get_all_companies) in its (created_at DESC, id DESC)
+-- order, so a filtered page is an index range read instead of a scan of
+-- every company followed by a sort. ?name= is served by the trigram index,
+-- and the per-company child listings by the (company_id, created_at DESC,
+-- id DESC) indexes, both from earlier migrations.
+
+CREATE INDEX IF NOT EXISTS idx_os_construction_is_verified_created_at_id
+    ON os_construction (is_verified, created_at DESC, id DESC);
\ No newline at end of file
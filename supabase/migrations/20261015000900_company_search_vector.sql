@@ -0,0 +1,17 @@
+-- Word-prefix search over company name and description for
+-- OSConstructionManager.get_all_companies(name_search=...).
+-- search_vec is a PostgREST computed field: it can be filtered on
+-- (?search_vec=fts(simple).<query>) but is not part of select=*, so company
+-- rows keep their shape. The function is inlined into the query, so the
+-- planner matches the expression index below instead of scanning the table.
+
+CREATE OR REPLACE FUNCTION search_vec(os_construction)
+RETURNS tsvector
+LANGUAGE sql
+IMMUTABLE
+AS $$
+    SELECT to_tsvector('simple', coalesce($1.company_name, '') || ' ' || coalesce($1.description, ''));
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_os_construction_search_vec
+    ON os_construction USING gin (to_tsvector('simple', coalesce(company_name, '') || ' ' || coalesce(description, '')));
\ No newline at end of file
@@ -0,0 +1,81 @@
+-- Offset pages of a company's services, projects and employees for the
+-- OSConstructionManager listings. Each call returns one row: whether the
+-- company exists, the page (JSONB array, newest first) and the total, so a
+-- listing is a single request instead of an existence check plus a counted
+-- select. They are plpgsql so Postgres caches the statement plans per
+-- connection instead of planning the SQL PostgREST builds on every call.
+-- A table result keeps the response a JSON array, which postgrest-py requires.
+
+CREATE OR REPLACE FUNCTION list_company_services(cid UUID, p_page INT, p_per_page INT)
+RETURNS TABLE (company_exists BOOLEAN, data JSONB, total BIGINT)
+LANGUAGE plpgsql
+STABLE
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        EXISTS (SELECT 1 FROM os_construction c WHERE c.id = cid),
+        COALESCE((
+            SELECT jsonb_agg(page ORDER BY page.created_at DESC, page.id DESC)
+            FROM (
+                SELECT *
+                FROM os_construction_services s
+                WHERE s.company_id = cid
+                ORDER BY s.created_at DESC, s.id DESC
+                OFFSET (p_page - 1) * p_per_page
+                LIMIT p_per_page
+            ) page
+        ), '[]'::jsonb),
+        (SELECT count(*) FROM os_construction_services s WHERE s.company_id = cid);
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION list_company_projects(cid UUID, p_page INT, p_per_page INT, p_status TEXT DEFAULT NULL)
+RETURNS TABLE (company_exists BOOLEAN, data JSONB, total BIGINT)
+LANGUAGE plpgsql
+STABLE
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        EXISTS (SELECT 1 FROM os_construction c WHERE c.id = cid),
+        COALESCE((
+            SELECT jsonb_agg(page ORDER BY page.created_at DESC, page.id DESC)
+            FROM (
+                SELECT *
+                FROM os_construction_projects p
+                WHERE p.company_id = cid
+                  AND (p_status IS NULL OR p.status = p_status)
+                ORDER BY p.created_at DESC, p.id DESC
+                OFFSET (p_page - 1) * p_per_page
+                LIMIT p_per_page
+            ) page
+        ), '[]'::jsonb),
+        (SELECT count(*) FROM os_construction_projects p
+         WHERE p.company_id = cid AND (p_status IS NULL OR p.status = p_status));
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION list_company_employees(cid UUID, p_page INT, p_per_page INT)
+RETURNS TABLE (company_exists BOOLEAN, data JSONB, total BIGINT)
+LANGUAGE plpgsql
+STABLE
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        EXISTS (SELECT 1 FROM os_construction c WHERE c.id = cid),
+        COALESCE((
+            SELECT jsonb_agg(page ORDER BY page.created_at DESC, page.id DESC)
+            FROM (
+                SELECT *
+                FROM os_construction_employees e
+                WHERE e.company_id = cid
+                ORDER BY e.created_at DESC, e.id DESC
+                OFFSET (p_page - 1) * p_per_page
+                LIMIT p_per_page
+            ) page
+        ), '[]'::jsonb),
+        (SELECT count(*) FROM os_construction_employees e WHERE e.company_id = cid);
+END;
+$$;
\ No newline at end of file
@@ -0,0 +1,43 @@
+-- Bulk seed for setup_database_improved.create_sample_data: inserts the
+-- companies and gives every one of them the same services, projects and
+-- employees, all in one request. The inserts are a single statement, so a
+-- failure rolls the whole seed back instead of leaving a half-seeded
+-- database. The arguments are JSON arrays of rows already validated by the
+-- *Create models; the new company IDs come back as a table, which
+-- postgrest-py requires of RPC results. Only the service role may run it.
+
+CREATE OR REPLACE FUNCTION seed_companies(companies JSONB, services JSONB, projects JSONB, employees JSONB)
+RETURNS TABLE (id UUID)
+LANGUAGE sql
+AS $$
+    WITH new_companies AS (
+        INSERT INTO os_construction (company_name, company_address, company_email, company_phone,
+                                     website, description, founded_year, is_verified)
+        SELECT c.company_name, c.company_address, c.company_email, c.company_phone,
+               c.website, c.description, c.founded_year, COALESCE(c.is_verified, FALSE)
+        FROM jsonb_populate_recordset(NULL::os_construction, companies) c
+        RETURNING os_construction.id
+    ), new_services AS (
+        INSERT INTO os_construction_services (company_id, service_name, description, is_free, eligibility_criteria)
+        SELECT nc.id, s.service_name, s.description, COALESCE(s.is_free, TRUE), s.eligibility_criteria
+        FROM new_companies nc
+        CROSS JOIN jsonb_populate_recordset(NULL::os_construction_services, services) s
+    ), new_projects AS (
+        INSERT INTO os_construction_projects (company_id, project_name, location, start_date, end_date,
+                                              status, description, beneficiary_info)
+        SELECT nc.id, p.project_name, p.location, p.start_date, p.end_date,
+               COALESCE(p.status, 'planned'), p.description, p.beneficiary_info
+        FROM new_companies nc
+        CROSS JOIN jsonb_populate_recordset(NULL::os_construction_projects, projects) p
+    ), new_employees AS (
+        INSERT INTO os_construction_employees (company_id, full_name, position, email, phone,
+                                               specialization, join_date)
+        SELECT nc.id, e.full_name, e.position, e.email, e.phone, e.specialization, e.join_date
+        FROM new_companies nc
+        CROSS JOIN jsonb_populate_recordset(NULL::os_construction_employees, employees) e
+    )
+    SELECT nc.id FROM new_companies nc;
+$$;
+
+REVOKE EXECUTE ON FUNCTION seed_companies(JSONB, JSONB, JSONB, JSONB) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION seed_companies(JSONB, JSONB, JSONB, JSONB) TO service_role;
\ No newline at end of file
@@ -1,27 +1,181 @@
 import os
-from functools import lru_cache
-from supabase import create_client, Client
+import weakref
+import threading
+from typing import Optional
+import httpx
+from postgrest import SyncPostgrestClient
+from postgrest.utils import SyncClient
+from supabase import Client
+from supabase.lib.client_options import ClientOptions
 from dotenv import load_dotenv
 
+from metrics import EVENT_HOOKS
+
 # Load environment variables
 load_dotenv()
 
-@lru_cache(maxsize=1)
+# Credentials are read once at import; the client is built from these constants
+SUPABASE_URL = os.environ.get("SUPABASE_URL")
+SUPABASE_KEY = os.environ.get("SUPABASE_KEY")
+
+# Connection pool settings shared by every PostgREST call made through the client.
+# PostgREST sits in front of Supavisor, so this caps HTTP connections per worker,
+# not Postgres backends; keep it in line with the pooler's client limit.
+MAX_CONNECTIONS = int(os.environ.get("SUPABASE_MAX_CONNECTIONS", "60"))
+HTTP_LIMITS = httpx.Limits(
+    max_connections=MAX_CONNECTIONS,
+    max_keepalive_connections=max(1, MAX_CONNECTIONS * 2 // 3),
+    keepalive_expiry=60
+)
+HTTP_TIMEOUT = httpx.Timeout(30.0)
+
+# Seconds a replaced shared client's pool stays open, so requests other
+# threads already started on it can finish (each wait is bounded by HTTP_TIMEOUT)
+RETIRED_POOL_GRACE = 60
+
+# Opt-in: give every thread its own client and connection pool instead of one
+# shared per process. Isolates threads that hammer the API at once, at the cost
+# of more open connections and no HTTP/2 multiplexing between them. Leave it off
+# under gevent, where every greenlet would get a client of its own.
+CLIENT_PER_THREAD = os.environ.get("SUPABASE_CLIENT_PER_THREAD", "").lower() in ("1", "true", "yes")
+
+
+class PooledPostgrestClient(SyncPostgrestClient):
+    """PostgREST client whose session keeps a tuned keep-alive connection pool.
+
+    HTTP/2 is negotiated with Supabase over TLS, so concurrent requests from
+    threads or greenlets multiplex over a few connections instead of each
+    holding its own. Every call made through the session is also counted and timed (see metrics.py).
+    """
+
+    def create_session(self, base_url, headers, timeout) -> SyncClient:
+        return SyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            limits=HTTP_LIMITS,
+            http2=True,
+            event_hooks=EVENT_HOOKS
+        )
+
+
+class PooledClient(Client):
+    """Supabase client that routes table and RPC calls through PooledPostgrestClient."""
+
+    @staticmethod
+    def _init_postgrest_client(rest_url, headers, schema, timeout=HTTP_TIMEOUT) -> SyncPostgrestClient:
+        return PooledPostgrestClient(rest_url, headers=headers, schema=schema, timeout=timeout)
+
+
+def create_pooled_client() -> Client:
+    """Build a Supabase client with its own PostgREST connection pool.
+
+    Returns:
+        Client: A new Supabase client instance
+
+    Raises:
+        ValueError: If Supabase credentials are missing
+    """
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("Missing Supabase credentials. Set SUPABASE_URL and SUPABASE_KEY environment variables.")
+
+    return PooledClient(
+        SUPABASE_URL,
+        SUPABASE_KEY,
+        options=ClientOptions(postgrest_client_timeout=HTTP_TIMEOUT)
+    )
+
+
+def close_with(owner, client: Client) -> weakref.finalize:
+    """Close client's connection pool once owner is garbage collected.
+
+    A weakref.finalize callback also runs at interpreter exit, but unlike an
+    atexit registration it doesn't keep owner (or the client) alive until then.
+    """
+    return weakref.finalize(owner, client.postgrest.session.aclose)
+
+
+class ThreadClient:
+    """A thread's own client, held only by that thread's thread_clients.
+
+    When the thread ends its thread-local storage is released, this holder
+    goes with it and the client's connection pool is closed.
+    """
+    __slots__ = ("client", "__weakref__")
+
+    def __init__(self, client: Client):
+        self.client = client
+        close_with(self, client)
+
+
+# The process-wide client (with the finalizer that closes its pool), or, when
+# CLIENT_PER_THREAD is on, each thread's ThreadClient. client_lock serializes
+# building and replacing them.
+shared_client: Optional[Client] = None
+shared_client_closer: Optional[weakref.finalize] = None
+thread_clients = threading.local()
+client_lock = threading.Lock()
+
+
 def get_supabase_client() -> Client:
     """Initialize and return a cached Supabase client.
-    
-    Uses lru_cache for connection pooling to improve performance.
-    
+
+    One client (and so one httpx connection pool) is shared by the whole
+    process, so TCP/TLS handshakes are paid once per connection rather than
+    once per request. With SUPABASE_CLIENT_PER_THREAD set, each thread gets
+    and keeps its own client instead, closed when the thread ends.
+
     Returns:
         Client: A Supabase client instance
-        
+
     Raises:
         ValueError: If Supabase credentials are missing
     """
-    supabase_url = os.environ.get("SUPABASE_URL")
-    supabase_key = os.environ.get("SUPABASE_KEY")
-    
-    if not supabase_url or not supabase_key:
-        raise ValueError("Missing Supabase credentials. Set SUPABASE_URL and SUPABASE_KEY environment variables.")
-    
-    return create_client(supabase_url, supabase_key)
\ No newline at end of file
+    global shared_client, shared_client_closer
+    if CLIENT_PER_THREAD:
+        holder = getattr(thread_clients, "holder", None)
+        if holder is None:
+            holder = thread_clients.holder = ThreadClient(create_pooled_client())
+        return holder.client
+
+    client = shared_client
+    if client is None:
+        with client_lock:
+            if shared_client is None:
+                shared_client = create_pooled_client()
+                shared_client_closer = close_with(shared_client, shared_client)
+            client = shared_client
+    return client
+
+
+def reset_supabase_client(stale: Optional[Client] = None) -> None:
+    """Replace the cached client so the next call builds a fresh one.
+
+    Replaces the shared client, or only the calling thread's one when
+    CLIENT_PER_THREAD is on. Pass the client that failed as stale: if another
+    thread has already replaced it, nothing happens, so threads failing at
+    the same time rebuild the pool once instead of each discarding the last.
+
+    Other threads may still be mid-request on the shared client's pool, so
+    it is closed RETIRED_POOL_GRACE seconds later rather than straight away.
+    A thread's own client is only used by that thread and closes at once.
+    """
+    global shared_client, shared_client_closer
+    with client_lock:
+        if CLIENT_PER_THREAD:
+            holder = getattr(thread_clients, "holder", None)
+            if holder is not None and (stale is None or stale is holder.client):
+                del thread_clients.holder
+            return
+
+        if shared_client is None or (stale is not None and stale is not shared_client):
+            return
+        retired, closer = shared_client, shared_client_closer
+        shared_client = shared_client_closer = None
+
+    # Query builders hold the session, not the client, so the client may be
+    # collected while requests are still running on its pool
+    closer.detach()
+    timer = threading.Timer(RETIRED_POOL_GRACE, retired.postgrest.session.aclose)
+    timer.daemon = True
+    timer.start()
\ No newline at end of file
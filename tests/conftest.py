@@ -0,0 +1,54 @@
+import os
+import sys
+
+import httpx
+import pytest
+from postgrest import SyncPostgrestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("SUPABASE_URL", "http://supabase.test")
+# supabase-py only checks that the key is shaped like a JWT
+os.environ.setdefault("SUPABASE_KEY", "test.key.signature")
+
+
+def postgrest_handler(tables):
+    """httpx handler answering selects the way PostgREST does.
+
+    Only what the pagination code relies on is emulated: Range pages, the
+    exact count in Content-Range, single-object reads and the 416
+    (PGRST103) answer for an offset past the last row. Filters are ignored.
+    """
+    def handle(request):
+        rows = tables[request.url.path.rsplit("/", 1)[-1]]
+        total = len(rows)
+
+        if request.headers.get("accept") == "application/vnd.pgrst.object+json":
+            return httpx.Response(200, json=rows[0])
+
+        start, end = 0, total - 1
+        if "range" in request.headers:
+            start, end = map(int, request.headers["range"].split("-"))
+        if start > 0 and start >= total:
+            return httpx.Response(416, headers={"content-range": f"*/{total}"}, json={
+                "code": "PGRST103",
+                "message": "Requested range not satisfiable",
+                "details": f"An offset of {start} was requested, but there are only {total} rows.",
+                "hint": None,
+            })
+
+        page = rows[start:end + 1]
+        content_range = f"{start}-{start + len(page) - 1}/{total}" if page else f"*/{total}"
+        return httpx.Response(200, headers={"content-range": content_range}, json=page)
+
+    return handle
+
+
+@pytest.fixture
+def postgrest():
+    """Build a PostgREST client whose requests are answered from in-memory tables."""
+    def build(tables):
+        client = SyncPostgrestClient("http://postgrest.test")
+        client.session = httpx.Client(base_url="http://postgrest.test",
+                                      transport=httpx.MockTransport(postgrest_handler(tables)))
+        return client
+    return build
\ No newline at end of file
@@ -0,0 +1,35 @@
+import uuid
+import warnings
+
+from models import ProjectResponse
+from os_construction import _row_to_response
+
+PROJECT_ROW = {
+    "id": str(uuid.uuid4()),
+    "company_id": str(uuid.uuid4()),
+    "project_name": "Community Center",
+    "location": "Springfield",
+    "start_date": "2026-03-01",
+    "end_date": None,
+    "status": "planned",
+    "description": None,
+    "beneficiary_info": None,
+    "created_at": "2026-02-01T10:15:30.12+00:00",
+    "updated_at": "2026-02-01T10:15:30+00:00",
+    "search_vec": "'center':2 'community':1",
+}
+
+
+def test_trusted_row_matches_validated_model():
+    project = _row_to_response(ProjectResponse, PROJECT_ROW)
+
+    assert project == ProjectResponse.model_validate(PROJECT_ROW)
+    assert not hasattr(project, "search_vec")
+
+
+def test_trusted_row_serializes_without_warnings():
+    project = _row_to_response(ProjectResponse, PROJECT_ROW)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        project.model_dump_json()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import uuid
+
+import pytest
+
+from pagination import fetch_offset_page
+
+SERVICES = [{"id": str(uuid.uuid4()), "service_name": f"Service {i}"} for i in range(5)]
+COMPANIES = [{"id": str(uuid.uuid4()), "company_name": f"Company {i}"} for i in range(5)]
+
+
+def test_offset_pages_hold_per_page_rows(postgrest):
+    client = postgrest({"services": SERVICES})
+
+    rows, total = fetch_offset_page(client.table("services").select("*", count="exact"), 1, 2)
+
+    assert rows == SERVICES[:2]
+    assert total == 5
+
+
+def test_last_page_is_partial(postgrest):
+    client = postgrest({"services": SERVICES})
+
+    rows, total = fetch_offset_page(client.table("services").select("*", count="exact"), 3, 2)
+
+    assert rows == SERVICES[4:]
+    assert total == 5
+
+
+def test_page_past_the_end_is_empty(postgrest):
+    client = postgrest({"services": SERVICES})
+
+    rows, total = fetch_offset_page(client.table("services").select("*", count="exact"), 4, 2)
+
+    assert rows == []
+    assert total == 5
+
+
+@pytest.fixture
+def api(postgrest, monkeypatch, tmp_path):
+    """app_improved's test client, reading from in-memory tables."""
+    # app_improved writes its logs under the working directory on import
+    monkeypatch.chdir(tmp_path)
+    import app_improved
+
+    client = postgrest({
+        "os_construction": [{"id": "c1", "company_name": "Acme"}],
+        "os_construction_services": SERVICES,
+    })
+    monkeypatch.setattr(app_improved, "get_supabase_client", lambda: client)
+    return app_improved.app.test_client()
+
+
+def test_api_page_past_the_end_is_empty(api):
+    response = api.get("/api/companies/c1/services?page=2&per_page=5")
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "data": [],
+        "pagination": {"page": 2, "per_page": 5, "total": 5, "pages": 1},
+    }
+
+
+@pytest.fixture
+def manager(postgrest, monkeypatch):
+    """OSConstructionManager reading companies from an in-memory table."""
+    import os_construction_manager
+
+    client = postgrest({"os_construction": COMPANIES})
+    monkeypatch.setattr(os_construction_manager, "get_supabase_client", lambda: client)
+    return os_construction_manager.OSConstructionManager()
+
+
+def test_manager_pages_hold_per_page_rows(manager):
+    result = manager.get_all_companies(page=1, per_page=2)
+
+    assert result["data"] == COMPANIES[:2]
+    assert result["pagination"] == {"page": 1, "per_page": 2, "total": 5, "pages": 3}
+
+
+def test_manager_page_past_the_end_is_empty(manager):
+    result = manager.get_all_companies(page=4, per_page=2)
+
+    assert result["data"] == []
+    assert result["pagination"] == {"page": 4, "per_page": 2, "total": 5, "pages": 3}
\ No newline at end of file
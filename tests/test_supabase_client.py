@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+
+import supabase_client
+
+
+@pytest.fixture(autouse=True)
+def fresh_client(monkeypatch):
+    """Start every test without a cached client."""
+    monkeypatch.setattr(supabase_client, "shared_client", None)
+    monkeypatch.setattr(supabase_client, "shared_client_closer", None)
+    monkeypatch.setattr(supabase_client, "CLIENT_PER_THREAD", False)
+
+
+def test_reset_leaves_the_old_pool_open_for_requests_in_flight():
+    client = supabase_client.get_supabase_client()
+
+    supabase_client.reset_supabase_client(stale=client)
+
+    assert supabase_client.get_supabase_client() is not client
+    assert not client.postgrest.session.is_closed
+
+
+def test_reset_closes_the_old_pool_after_the_grace_period(monkeypatch):
+    monkeypatch.setattr(supabase_client, "RETIRED_POOL_GRACE", 0)
+    client = supabase_client.get_supabase_client()
+    session = client.postgrest.session
+
+    running = set(threading.enumerate())
+    supabase_client.reset_supabase_client(stale=client)
+    del client
+    for thread in set(threading.enumerate()) - running:
+        thread.join()
+
+    assert session.is_closed
+
+
+def test_reset_with_an_already_replaced_client_keeps_the_current_one():
+    stale = supabase_client.get_supabase_client()
+    supabase_client.reset_supabase_client(stale=stale)
+    current = supabase_client.get_supabase_client()
+
+    supabase_client.reset_supabase_client(stale=stale)
+
+    assert supabase_client.get_supabase_client() is current
\ No newline at end of file
@@ -0,0 +1,9 @@
+# Entry point for the authenticated API under gevent:
+#   GUNICORN_WORKER_CLASS=gevent gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Patch the standard library before anything imports socket/ssl, so httpx's
+# blocking PostgREST calls yield to other greenlets while waiting on the network.
+from gevent import monkey
+monkey.patch_all()
+
+from app_improved import app  # noqa: E402,F401
\ No newline at end of file